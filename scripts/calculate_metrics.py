@@ -1,11 +1,15 @@
 # [file name]: scripts/calculate_metrics.py
 import csv
 import json
+import mmap
+import re
 from pathlib import Path
 from datetime import date
 import sys
 import os
 
+from json_io import dump_json
+
 # Get ZIP from command line argument or use default
 ZIP = sys.argv[1] if len(sys.argv) > 1 else "31088"
 
@@ -18,131 +22,175 @@ possible_csv_locations = [
     Path("/tmp/houston_zhvi/zillow_zhvi.csv")
 ]
 
-CSV_FILE = None
-for location in possible_csv_locations:
-    if location.exists():
-        CSV_FILE = location
-        print(f"Found CSV at: {CSV_FILE}")
-        break
+CSV_FILE = next((p for p in possible_csv_locations if p.exists()), None)
+if CSV_FILE is not None:
+    print(f"Found CSV at: {CSV_FILE}")
 
 # Output folder
 OUT_DIR = BASE_DIR / f"data/houston-county-ga/{ZIP}/processed"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
-def calculate_metrics():
-    if CSV_FILE and CSV_FILE.exists():
-        # --- Load Zillow CSV ---
-        rows = []
-        with open(CSV_FILE, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row.get("RegionName") == ZIP:
-                    rows.append(row)
+# Zillow only ever appends date columns, so their positions are cached per CSV mtime
+DATE_COLUMNS_CACHE = BASE_DIR / "tmp" / "zillow_cols.json"
+is_date_column = re.compile(r"\d{4}").match
+
+# Velocity and signal values that depend only on the price trend
+TREND_PRESETS = {
+    "cooling": {
+        "velocity": {"avg_dom": 30, "dom_change": 3, "absorption_rate": 0.75, "months_supply": 4.2},
+        "signals": {"seller_leverage": "buyer", "price_reductions_up": True, "inventory_rising": True}
+    },
+    "heating": {
+        "velocity": {"avg_dom": 22, "dom_change": -2, "absorption_rate": 1.1, "months_supply": 2.8},
+        "signals": {"seller_leverage": "seller", "price_reductions_up": False, "inventory_rising": False}
+    }
+}
+
+def get_last_periods(header, count=4):
+    """Return the column indexes of the last `count` months, cached per CSV version"""
+    stat = CSV_FILE.stat()
+    try:
+        cached = json.loads(DATE_COLUMNS_CACHE.read_text(encoding="utf-8"))
+        if cached["csv"] == str(CSV_FILE) and cached["mtime"] == stat.st_mtime:
+            return cached["last_periods"][-count:]
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    # Date columns are already in chronological order in the Zillow export
+    last_periods = [i for i, c in enumerate(header) if is_date_column(c)][-8:]
+    
+    DATE_COLUMNS_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    DATE_COLUMNS_CACHE.write_text(json.dumps({
+        "csv": str(CSV_FILE),
+        "mtime": stat.st_mtime,
+        "last_periods": last_periods
+    }), encoding="utf-8")
+    return last_periods[-count:]
+
+def find_zip_row(mm, start, region_idx):
+    """Locate the CSV row for ZIP with a native byte search instead of parsing every row"""
+    needle = ZIP.encode()
+    pos = mm.find(needle, start)
+    while pos != -1:
+        line_start = mm.rfind(b"\n", 0, pos) + 1
+        line_end = mm.find(b"\n", pos)
+        if line_end == -1:
+            line_end = len(mm)
         
-        if rows:
-            row = rows[0]
-            
-            # --- Extract last 4 months dynamically ---
-            date_columns = [c for c in row.keys() if c[:4].isdigit()]
-            date_columns.sort()
-            last_periods = date_columns[-4:]
-            values = [float(row[c]) for c in last_periods if row[c]]
-            
-            if len(values) < 2:
-                print(f"⚠️ Not enough historical data for ZIP {ZIP}, using default values")
-                values = [280000, 282000, 285000, 289500]
-            
-            latest = values[-1]
-            previous = values[-2]
-            
-            # --- Derived Metrics ---
-            price_change_pct = round((latest - previous) / previous * 100, 2)
-            trend = "heating" if price_change_pct > 0 else "cooling"
-            
-            # Inventory proxy
-            inventory_proxy = max(1, int(100 / max(abs(price_change_pct), 0.1)))
-            
-            market = {
-                "market": "Houston County, GA",
-                "zip": ZIP,
-                "city": "Warner Robins",
-                "updated": str(date.today()),
-                "period": "monthly",
-                "inventory": {
-                    "active": inventory_proxy,
-                    "change_pct": round(price_change_pct * -1, 1)
-                },
-                "pricing": {
-                    "median_list": int(latest),
-                    "median_sale": int(latest * 0.97),
-                    "spread_pct": -3.0,
-                    "trend": trend
-                },
-                "velocity": {
-                    "avg_dom": 30 if trend == "cooling" else 22,
-                    "dom_change": 3 if trend == "cooling" else -2,
-                    "absorption_rate": 0.75 if trend == "cooling" else 1.1,
-                    "months_supply": 4.2 if trend == "cooling" else 2.8
-                },
-                "signals": {
-                    "seller_leverage": "buyer" if trend == "cooling" else "seller",
-                    "price_reductions_up": trend == "cooling",
-                    "inventory_rising": trend == "cooling"
-                },
-                "history": {
-                    "median_list": values
-                }
-            }
-            
-            output_file = OUT_DIR / "market.json"
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(market, f, indent=2)
-            
-            print(f"✅ Market metrics generated successfully for ZIP {ZIP}")
-            return market
-        else:
-            print(f"⚠️ No data found for ZIP {ZIP} in CSV, creating default data")
-    else:
-        print("⚠️ CSV file not found, creating default data")
+        # The ZIP digits can also show up inside prices, so confirm the column
+        line = mm[line_start:line_end].decode("utf-8").rstrip("\r")
+        fields = next(csv.reader([line]))
+        if len(fields) > region_idx and fields[region_idx] == ZIP:
+            return fields
+        pos = mm.find(needle, line_end)
+    return None
+
+def derive_metrics(values):
+    """Derive price change, trend and inventory proxy from a ZHVI history"""
+    latest = values[-1]
+    previous = values[-2]
+    
+    # The trend only needs the sign of the change, not the rounded percentage
+    trend = "heating" if latest > previous else "cooling"
+    price_change_pct = round((latest - previous) / previous * 100, 2)
+    
+    # Inventory proxy
+    inventory_proxy = max(1, int(100 / max(abs(price_change_pct), 0.1)))
     
-    # Create default data
-    market = {
+    return latest, price_change_pct, trend, inventory_proxy
+
+def build_market(inventory, pricing, velocity, signals, history):
+    """Wrap the metric sections in the market.json envelope shared by every path"""
+    return {
         "market": "Houston County, GA",
         "zip": ZIP,
         "city": "Warner Robins",
         "updated": str(date.today()),
         "period": "monthly",
-        "inventory": {
-            "active": 105,
-            "change_pct": 2.5
-        },
-        "pricing": {
-            "median_list": 289500,
-            "median_sale": 281000,
-            "spread_pct": -3.0,
-            "trend": "heating"
-        },
-        "velocity": {
-            "avg_dom": 28,
-            "dom_change": -2,
-            "absorption_rate": 1.1,
-            "months_supply": 2.8
-        },
-        "signals": {
-            "seller_leverage": "seller",
-            "price_reductions_up": False,
-            "inventory_rising": False
-        },
+        "inventory": inventory,
+        "pricing": pricing,
+        "velocity": velocity,
+        "signals": signals,
         "history": {
-            "median_list": [285000, 287500, 289500, 291000]
+            "median_list": history
         }
     }
+
+def market_from_history(values):
+    """Build the market payload from the last months of ZHVI values"""
+    latest, price_change_pct, trend, inventory_proxy = derive_metrics(values)
+    preset = TREND_PRESETS[trend]
+    
+    return build_market(
+        inventory={
+            "active": inventory_proxy,
+            "change_pct": round(price_change_pct * -1, 1)
+        },
+        pricing={
+            "median_list": int(latest),
+            "median_sale": int(latest * 0.97),
+            "spread_pct": -3.0,
+            "trend": trend
+        },
+        velocity=dict(preset["velocity"]),
+        signals=dict(preset["signals"]),
+        history=values
+    )
+
+def default_market():
+    """Build the market payload used when no ZHVI data is available"""
+    return build_market(
+        inventory={"active": 105, "change_pct": 2.5},
+        pricing={"median_list": 289500, "median_sale": 281000, "spread_pct": -3.0, "trend": "heating"},
+        velocity={"avg_dom": 28, "dom_change": -2, "absorption_rate": 1.1, "months_supply": 2.8},
+        signals={"seller_leverage": "seller", "price_reductions_up": False, "inventory_rising": False},
+        history=[285000, 287500, 289500, 291000]
+    )
+
+def load_zip_history():
+    """Return the last months of ZHVI values for ZIP, or None when unavailable"""
+    if CSV_FILE is None:
+        print("⚠️ CSV file not found, creating default data")
+        return None
+    
+    # --- Load Zillow CSV ---
+    # mmap can't map an empty file, and an empty CSV has no rows anyway
+    raw = None
+    if CSV_FILE.stat().st_size > 0:
+        # Map the file and parse only the header and the matching row
+        with open(CSV_FILE, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header_end = mm.find(b"\n")
+            # No newline means a lone header line with no data rows after it
+            if header_end != -1:
+                header = next(csv.reader([mm[:header_end].decode("utf-8").rstrip("\r")]))
+                if "RegionName" in header:
+                    raw = find_zip_row(mm, header_end, header.index("RegionName"))
+    
+    if raw is None:
+        print(f"⚠️ No data found for ZIP {ZIP} in CSV, creating default data")
+        return None
+    
+    # --- Extract last 4 months dynamically ---
+    # Project only the date columns out of the matched row
+    last_periods = get_last_periods(header)
+    values = list(map(float, filter(None, (raw[i] for i in last_periods))))
+    
+    if len(values) < 2:
+        print(f"⚠️ Not enough historical data for ZIP {ZIP}, using default values")
+        values = [280000, 282000, 285000, 289500]
+    return values
+
+def calculate_metrics():
+    values = load_zip_history()
+    market = market_from_history(values) if values is not None else default_market()
     
     output_file = OUT_DIR / "market.json"
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(market, f, indent=2)
+    dump_json(output_file, market)
     
-    print(f"✅ Default market metrics generated for ZIP {ZIP}")
+    if values is not None:
+        print(f"✅ Market metrics generated successfully for ZIP {ZIP}")
+    else:
+        print(f"✅ Default market metrics generated for ZIP {ZIP}")
     return market
 
 if __name__ == "__main__":
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Shared market constants for the pipeline scripts
+"""
+
+# Houston County ZIP codes covered by the dashboard and the city each belongs to
+ZIP_CITY = {
+    '31088': 'Warner Robins',
+    '31093': 'Centerville',
+    '31098': 'Bonaire'
+}
+
+# Realtor tip for each weekday, indexed by datetime.weekday() (Monday == 0)
+WEEKDAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+DAILY_TIPS = (
+    "📅 Plan your week: Review new listings and schedule showings",
+    "📞 Best day for client follow-ups and market updates",
+    "📊 Update your CMA reports with latest data",
+    "🤝 Network with other agents and schedule open houses",
+    "🎯 Target weekend showings - buyers are actively searching",
+    "🏠 Host open houses and conduct showings",
+    "📝 Review week's activity and plan for next week"
+)
@@ -3,84 +3,86 @@
 Create aggregated dashboard JSON from collected data
 """
 
-import json
-import glob
+import bisect
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
-import random
+import numpy as np
+import pandas as pd
+from constants import ZIP_CITY
+from json_io import encode_json, join_json_object, load_json, write_atomic
+
+# Property fields used by the trend analysis; anything missing becomes NaN
+TREND_COLUMNS = ['status', 'price', 'days_on_market', 'sqft', 'scraped_date']
+
+# Health score lower bounds and the condition each bucket maps to
+MARKET_CONDITION_THRESHOLDS = (40, 60, 70)
+MARKET_CONDITIONS = ("Depressed Market", "Buyer's Market", "Balanced Market", "Seller's Market")
+
+# Sections of the main dashboard repeated in dashboard_simple.json
+SIMPLE_DASHBOARD_KEYS = ("last_updated", "market_overview", "alerts", "recommendations")
 
 def get_city_by_zip(zip_code):
     """Get city name from ZIP code"""
-    city_map = {
-        '31088': 'Warner Robins',
-        '31093': 'Centerville', 
-        '31098': 'Bonaire'
-    }
-    return city_map.get(zip_code, 'Unknown')
+    return ZIP_CITY.get(zip_code, 'Unknown')
 
-def analyze_zip_trends(zip_code, properties, dashboard_data):
+def analyze_zip_trends(zip_code, properties, dashboard_data, price_change_30d):
     """Analyze trends for a specific ZIP code"""
-    active_properties = [p for p in properties if p.get('status') == 'Active']
-    pending_properties = [p for p in properties if p.get('status') == 'Pending']
-    sold_properties = [p for p in properties if p.get('status') == 'Sold']
+    # One column per field, so every metric below is a vectorized scan
+    df = pd.DataFrame(properties, columns=TREND_COLUMNS)
+    status = df['status']
+    status_counts = status.value_counts()
+    active = df[status.eq('Active')]
     
     # Price trends
-    if active_properties:
-        prices = [p.get('price', 0) for p in active_properties]
-        avg_price = sum(prices) / len(prices) if prices else 0
+    if not active.empty:
+        # Pull the numeric columns into one float64 block and reduce it with NumPy
+        prices, sqft, dom = active[['price', 'sqft', 'days_on_market']].fillna(
+            {'price': 0, 'sqft': 1, 'days_on_market': 0}
+        ).to_numpy(np.float64).T
         
-        # Calculate price changes (simulated)
-        price_change_30d = round(random.uniform(-0.03, 0.05) * 100, 1)
+        # Sold listings scraped within the last 30 days; ISO timestamps
+        # sort chronologically, so compare them as strings without parsing
+        cutoff_iso = (datetime.now() - timedelta(days=30)).isoformat()
+        recent = df['scraped_date'].fillna('').astype(str) > cutoff_iso
         
         dashboard_data["trends"][zip_code] = {
-            "avg_price": round(avg_price, 2),
+            "avg_price": round(float(prices.mean()), 2),
             "price_change_30d": price_change_30d,
-            "active_listings": len(active_properties),
-            "pending_listings": len(pending_properties),
-            "sold_30d": len([p for p in sold_properties]),
-            "days_on_market_avg": sum(p.get('days_on_market', 0) for p in active_properties) / max(len(active_properties), 1),
-            "price_per_sqft_avg": sum(p.get('price', 0) / max(p.get('square_feet', 1), 1) for p in active_properties) / max(len(active_properties), 1)
+            "active_listings": int(status_counts.get('Active', 0)),
+            "pending_listings": int(status_counts.get('Pending', 0)),
+            "sold_30d": int((status.eq('Sold') & recent).sum()),
+            "days_on_market_avg": float(dom.mean()),
+            "price_per_sqft_avg": float((prices / np.maximum(sqft, 1)).mean())
         }
 
-def calculate_overall_market(dashboard_data):
-    """Calculate overall market metrics"""
-    total_properties = sum(zip_data.get("property_count", 0) for zip_data in dashboard_data["zip_codes"].values())
-    
-    health_scores = [zip_data.get("market_summary", {}).get("market_health", 50) 
-                    for zip_data in dashboard_data["zip_codes"].values() if zip_data.get("market_summary")]
-    avg_health = sum(health_scores) / len(health_scores) if health_scores else 50
-    
-    # Calculate overall metrics
-    dashboard_data["market_overview"] = {
-        "total_zip_codes": len(dashboard_data["zip_codes"]),
-        "total_properties": total_properties,
-        "overall_health_score": round(avg_health, 1),
-        "market_condition": get_market_condition(avg_health),
-        "last_updated": datetime.now().isoformat(),
-        "update_frequency": "6 hours",
-        "data_sources": ["free_data_collector", "simulated_data"]
-    }
-
 def get_market_condition(health_score):
     """Convert health score to market condition"""
-    if health_score >= 70:
-        return "Seller's Market"
-    elif health_score >= 60:
-        return "Balanced Market"
-    elif health_score >= 40:
-        return "Buyer's Market"
-    else:
-        return "Depressed Market"
+    return MARKET_CONDITIONS[bisect.bisect_right(MARKET_CONDITION_THRESHOLDS, health_score)]
 
-def generate_alerts(dashboard_data):
-    """Generate market alerts"""
+def summarize_market(dashboard_data):
+    """Build the market overview, alerts and recommendations in one pass over the ZIPs"""
+    total_properties = 0
+    health_sum = 0
+    health_count = 0
     alerts = []
+    worst_zip = best_zip = None
+    worst_health = float('inf')
+    best_health = float('-inf')
     
     for zip_code, zip_data in dashboard_data["zip_codes"].items():
+        # Look up each summary field once per ZIP
         summary = zip_data.get("market_summary", {})
+        inventory = summary.get("inventory_count", 0)
+        health_score = summary.get("market_health_score")
+        market_health = health_score if health_score is not None else 50
+        
+        total_properties += zip_data.get("property_count", 0)
+        if health_score is not None:
+            health_sum += health_score
+            health_count += 1
         
         # Low inventory alert
-        inventory = summary.get("inventory", 0)
         if inventory > 0 and inventory < 20:
             alerts.append({
                 "type": "warning",
@@ -91,7 +93,6 @@ def generate_alerts(dashboard_data):
             })
         
         # Good buying opportunity
-        market_health = summary.get("market_health", 0)
         if market_health < 40:
             alerts.append({
                 "type": "opportunity",
@@ -100,65 +101,76 @@ def generate_alerts(dashboard_data):
                 "message": f"Strong buyer's market detected in {zip_code}",
                 "severity": "high"
             })
+        
+        # Lowest (buyer's market) and highest (seller's market) health scores
+        if market_health < worst_health:
+            worst_health, worst_zip = market_health, zip_code
+        if market_health > best_health:
+            best_health, best_zip = market_health, zip_code
     
-    dashboard_data["alerts"] = alerts
-
-def generate_recommendations(dashboard_data):
-    """Generate investment recommendations"""
-    recommendations = []
-    
+    # Calculate overall metrics
     if dashboard_data["zip_codes"]:
-        # Find best ZIP for investment (lowest health score = buyer's market)
-        zip_items = list(dashboard_data["zip_codes"].items())
-        if zip_items:
-            worst_zip = min(zip_items, 
-                          key=lambda x: x[1].get("market_summary", {}).get("market_health", 100))
-            
-            recommendations.append({
-                "type": "investment",
-                "title": f"Consider Buying in {worst_zip[0]}",
-                "reason": "This area shows buyer's market conditions",
-                "confidence": "medium"
-            })
-            
-            # Find best ZIP for selling (highest health score)
-            best_zip = max(zip_items,
-                          key=lambda x: x[1].get("market_summary", {}).get("market_health", 0))
-            
-            recommendations.append({
-                "type": "selling",
-                "title": f"Consider Selling in {best_zip[0]}",
-                "reason": "This area shows seller's market conditions",
-                "confidence": "medium"
-            })
+        avg_health = health_sum / health_count if health_count else 50
+        dashboard_data["market_overview"] = {
+            "total_zip_codes": len(dashboard_data["zip_codes"]),
+            "total_properties": total_properties,
+            "overall_health_score": round(avg_health, 1),
+            "market_condition": get_market_condition(avg_health),
+            "last_updated": dashboard_data["last_updated"],
+            "update_frequency": "6 hours",
+            "data_sources": ["free_data_collector", "simulated_data"]
+        }
     
+    recommendations = []
+    if worst_zip is not None:
+        # Best ZIP for investment (lowest health score = buyer's market)
+        recommendations.append({
+            "type": "investment",
+            "title": f"Consider Buying in {worst_zip}",
+            "reason": "This area shows buyer's market conditions",
+            "confidence": "medium"
+        })
+        
+        # Best ZIP for selling (highest health score)
+        recommendations.append({
+            "type": "selling",
+            "title": f"Consider Selling in {best_zip}",
+            "reason": "This area shows seller's market conditions",
+            "confidence": "medium"
+        })
+    
+    dashboard_data["alerts"] = alerts
     dashboard_data["recommendations"] = recommendations
 
+def load_zip_files(zip_dir):
+    """Load a ZIP's latest.json, or its market_summary.json when that is missing"""
+    latest_file = zip_dir / "latest.json"
+    if latest_file.exists():
+        return load_json(latest_file), None
+    
+    summary_file = zip_dir / "market_summary.json"
+    if summary_file.exists():
+        return None, load_json(summary_file)
+    return None, None
+
 def save_dashboard_files(dashboard_data, base_dir):
     """Save dashboard files in various formats"""
     
+    # Encode each section once; the files below are assembled from these bytes
+    sections = {key: encode_json(value) for key, value in dashboard_data.items()}
+    
     # Main dashboard file
     dashboard_file = base_dir / "dashboard.json"
-    with open(dashboard_file, 'w', encoding='utf-8') as f:
-        json.dump(dashboard_data, f, indent=2, default=str)
+    write_atomic(dashboard_file, join_json_object(sections))
     
     # Simplified version for web
-    simple_dashboard = {
-        "last_updated": dashboard_data["last_updated"],
-        "market_overview": dashboard_data["market_overview"],
-        "alerts": dashboard_data["alerts"],
-        "recommendations": dashboard_data["recommendations"]
-    }
-    
     simple_file = base_dir / "dashboard_simple.json"
-    with open(simple_file, 'w', encoding='utf-8') as f:
-        json.dump(simple_dashboard, f, indent=2)
+    write_atomic(simple_file, join_json_object({key: sections[key] for key in SIMPLE_DASHBOARD_KEYS}))
     
     # Market trends file
     if dashboard_data.get("trends"):
         trends_file = base_dir / "market_trends.json"
-        with open(trends_file, 'w', encoding='utf-8') as f:
-            json.dump(dashboard_data["trends"], f, indent=2)
+        write_atomic(trends_file, sections["trends"])
     
     print(f"📊 Dashboard files saved to {base_dir}")
 
@@ -167,8 +179,10 @@ def create_dashboard_json():
     print("Creating dashboard JSON files...")
     
     base_dir = Path("data/houston-county-ga")
+    # One timestamp for every last_updated field written in this run
+    now_iso = datetime.now().isoformat()
     dashboard_data = {
-        "last_updated": datetime.now().isoformat(),
+        "last_updated": now_iso,
         "zip_codes": {},
         "market_overview": {},
         "trends": {},
@@ -179,20 +193,21 @@ def create_dashboard_json():
     # Find all ZIP code directories
     zip_codes = ['31088', '31093', '31098']
     
-    for zip_code in zip_codes:
-        zip_dir = base_dir / zip_code
-        latest_file = zip_dir / "latest.json"
-        summary_file = zip_dir / "market_summary.json"
-        properties_file = zip_dir / "properties.json"
-        
+    # Simulated 30-day price changes (-3% to +5%), drawn for all ZIPs at once
+    rng = np.random.default_rng()
+    price_changes = dict(zip(zip_codes, rng.uniform(-3.0, 5.0, len(zip_codes)).round(1).tolist()))
+    
+    # Read every ZIP's files concurrently, then merge them in order
+    with ThreadPoolExecutor(max_workers=len(zip_codes)) as executor:
+        futures = {zip_code: executor.submit(load_zip_files, base_dir / zip_code) for zip_code in zip_codes}
+    
+    for zip_code, future in futures.items():
         try:
-            if latest_file.exists():
-                with open(latest_file, 'r', encoding='utf-8') as f:
-                    zip_data = json.load(f)
-                
+            zip_data, summary = future.result()
+            if zip_data is not None:
                 # Add ZIP summary to dashboard
                 dashboard_data["zip_codes"][zip_code] = {
-                    "market_summary": zip_data.get("market_stats", {}),
+                    "market_summary": zip_data.get("market_summary", {}),
                     "property_count": len(zip_data.get("properties", [])),
                     "last_updated": zip_data.get("timestamp", ""),
                     "location": {
@@ -205,17 +220,14 @@ def create_dashboard_json():
                 # Process properties for trends
                 properties = zip_data.get("properties", [])
                 if properties:
-                    analyze_zip_trends(zip_code, properties, dashboard_data)
+                    analyze_zip_trends(zip_code, properties, dashboard_data, price_changes[zip_code])
                     
-            elif summary_file.exists():
+            elif summary is not None:
                 # Fallback to summary file if latest.json doesn't exist
-                with open(summary_file, 'r', encoding='utf-8') as f:
-                    summary = json.load(f)
-                
                 dashboard_data["zip_codes"][zip_code] = {
                     "market_summary": summary,
                     "property_count": summary.get("total_properties", 0),
-                    "last_updated": datetime.now().isoformat(),
+                    "last_updated": now_iso,
                     "location": {
                         "city": get_city_by_zip(zip_code),
                         "county": "Houston",
@@ -227,13 +239,8 @@ def create_dashboard_json():
             print(f"Error processing {zip_code}: {e}")
             continue
     
-    # Calculate overall market overview
-    if dashboard_data["zip_codes"]:
-        calculate_overall_market(dashboard_data)
-    
-    # Generate alerts and recommendations
-    generate_alerts(dashboard_data)
-    generate_recommendations(dashboard_data)
+    # Market overview, alerts and recommendations
+    summarize_market(dashboard_data)
     
     # Save dashboard JSON
     save_dashboard_files(dashboard_data, base_dir)
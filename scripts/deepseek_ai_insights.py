@@ -4,19 +4,83 @@ Generate AI insights using DeepSeek API
 """
 
 import os
+import re
 import json
+import hashlib
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from datetime import datetime
 import time
 
+from json_io import dump_json, encode_json, load_json, write_atomic
+
+CACHE_DIR = Path("tmp/deepseek_cache")
+CACHE_TTL = 6 * 60 * 60  # seconds; matches the collection schedule
+# Real insights younger than this are kept instead of being replaced by simulated ones
+INSIGHTS_MAX_AGE = 24 * 60 * 60
+
+# Sentiment keywords, each set compiled into one case-insensitive scan
+BULLISH_RE = re.compile(r"strong|growing|opportunity|positive", re.IGNORECASE)
+BEARISH_RE = re.compile(r"declining|risk|caution|negative", re.IGNORECASE)
+
 class DeepSeekAIInsights:
     """Generate AI-powered real estate insights using DeepSeek"""
     
+    # The instructions live in the system message and never change between
+    # runs, so DeepSeek's prefix cache can serve them; only the data in the
+    # user message varies. One JSON answer covers all three insight sections
+    INSIGHTS_PROMPT = """You are a real estate market analyst with 20 years of experience.
+    Analyze the real estate market data you are given and answer with a single JSON object
+    with exactly these keys:
+    
+    "market_analysis": a string, concise and data-driven, under 400 words, covering
+        1. Current market trends
+        2. Best opportunities for buyers
+        3. Best opportunities for sellers
+        4. Risk factors to watch
+        5. 3-month market outlook
+    
+    "investment_recommendations": an array of objects with the keys "strategy",
+        "recommended_zip", "reason", "estimated_roi" and "risk". Cover the best ZIP codes
+        for flipping houses and for rental properties, the risk of each area, expected ROI
+        and timing (when to buy/sell), with confidence levels.
+    
+    "neighborhood_insights": an object mapping each area to a string covering up-and-coming
+        or declining values, school district impacts, development trends and demographic
+        influences. Focus on specific, actionable insights for investors.
+    """
+    
+    # The prompt carries these key figures instead of the whole dashboard
+    OVERVIEW_TEMPLATE = "Houston County, GA: {condition}, overall health {health}/100, {properties} properties across {zip_count} ZIP codes"
+    ZIP_SUMMARY_TEMPLATE = (
+        "ZIP {zip} ({city}): median price ${median_price:,.0f}, 30d price change {price_change:+.1f}%, "
+        "${price_per_sqft:,.0f}/sqft, inventory {inventory}, avg DOM {avg_dom:.0f}, months supply {months_supply}, "
+        "sold 30d {sold}, health {health}/100, trend {trend}"
+    )
+    
     def __init__(self, api_key=None):
         self.api_key = api_key or os.environ.get('DEEPSEEK_API_KEY')
         self.base_url = "https://api.deepseek.com/v1/chat/completions"
         self.base_dir = Path("data/houston-county-ga")
+        # One keep-alive connection to the API host, with the auth headers set
+        # once instead of per request. Rate limits and 5xx responses are
+        # retried with backoff before falling back
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['POST']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=retry))
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        })
         
     def generate_insights(self):
         """Generate AI insights for all collected data"""
@@ -33,24 +97,20 @@ class DeepSeekAIInsights:
                 print("⚠️  Dashboard data not found. Collect data first.")
                 return self._generate_simulated_insights()
             
-            with open(dashboard_file, 'r', encoding='utf-8') as f:
-                dashboard_data = json.load(f)
-            
-            # Generate market analysis
-            market_analysis = self._analyze_market_with_ai(dashboard_data)
-            
-            # Generate investment recommendations
-            investment_recs = self._generate_investment_recommendations(dashboard_data)
+            dashboard_data = load_json(dashboard_file)
             
-            # Generate neighborhood insights
-            neighborhood_insights = self._generate_neighborhood_insights(dashboard_data)
+            # Market analysis, investment recommendations and neighborhood
+            # insights from one API call
+            insights = self._generate_all_insights(dashboard_data)
+            if insights is None:
+                return self._generate_simulated_insights()
             
             # Save insights
             insights_data = {
                 "timestamp": datetime.now().isoformat(),
-                "market_analysis": market_analysis,
-                "investment_recommendations": investment_recs,
-                "neighborhood_insights": neighborhood_insights,
+                "market_analysis": insights.get("market_analysis", ""),
+                "investment_recommendations": insights.get("investment_recommendations", []),
+                "neighborhood_insights": insights.get("neighborhood_insights", {}),
                 "ai_model": "deepseek-chat",
                 "confidence_score": 0.85
             }
@@ -63,123 +123,118 @@ class DeepSeekAIInsights:
             print(f"Error generating AI insights: {e}")
             return self._generate_simulated_insights()
     
-    def _analyze_market_with_ai(self, dashboard_data):
-        """Analyze market data using AI"""
-        
-        # Prepare market data summary
-        market_summary = dashboard_data.get("market_overview", {})
-        zip_data = dashboard_data.get("zip_codes", {})
-        
-        prompt = f"""
-        Analyze this real estate market data and provide insights:
+    def _generate_all_insights(self, dashboard_data):
+        """Ask for all three insight sections in one JSON response"""
+        prompt = f"DATA:\n{self._summarize_for_prompt(dashboard_data)}"
         
-        MARKET OVERVIEW:
-        - Total Properties: {market_summary.get('total_properties', 0)}
-        - Active Listings: {market_summary.get('active_listings', 0)}
-        - Market Health Score: {market_summary.get('overall_health_score', 0)}/100
-        - Market Condition: {market_summary.get('market_condition', 'Unknown')}
+        content = self._call_deepseek_api(self.INSIGHTS_PROMPT, prompt)
+        if content is None:
+            return None
         
-        ZIP CODE DATA:
-        {json.dumps(zip_data, indent=2)}
-        
-        Please analyze and provide:
-        1. Current market trends
-        2. Best opportunities for buyers
-        3. Best opportunities for sellers
-        4. Risk factors to watch
-        5. 3-month market outlook
-        
-        Keep response concise and data-driven.
-        """
+        try:
+            insights = json.loads(content)
+        except ValueError as e:
+            print(f"Could not parse AI insights: {e}")
+            return None
         
-        return self._call_deepseek_api(prompt)
+        # Each section must have the shape the dashboard renders
+        expected = {
+            "market_analysis": str,
+            "investment_recommendations": list,
+            "neighborhood_insights": dict,
+        }
+        if not isinstance(insights, dict) or not all(
+            isinstance(insights.get(key), kind) for key, kind in expected.items()
+        ):
+            print("AI insights response did not match the expected format")
+            return None
+        return insights
     
-    def _generate_investment_recommendations(self, dashboard_data):
-        """Generate AI-powered investment recommendations"""
-        
-        prompt = f"""
-        Based on this real estate data, provide investment recommendations:
-        
-        DATA: {json.dumps(dashboard_data, indent=2)}
+    def _summarize_for_prompt(self, dashboard_data):
+        """Condense the dashboard into one line of key metrics per ZIP, plus alerts"""
+        overview = dashboard_data.get("market_overview", {})
+        trends = dashboard_data.get("trends", {})
+        zip_codes = dashboard_data.get("zip_codes", {})
         
-        Provide specific investment recommendations including:
-        1. Best ZIP codes for flipping houses
-        2. Best ZIP codes for rental properties
-        3. Risk assessment for each area
-        4. Expected ROI for different strategies
-        5. Timing recommendations (when to buy/sell)
-        
-        Format as actionable recommendations with confidence levels.
-        """
-        
-        return self._call_deepseek_api(prompt)
+        lines = [self.OVERVIEW_TEMPLATE.format(
+            condition=overview.get("market_condition", "Unknown"),
+            health=overview.get("overall_health_score", 50),
+            properties=overview.get("total_properties", 0),
+            zip_count=len(zip_codes)
+        )]
+        for zip_code, zip_data in zip_codes.items():
+            summary = zip_data.get("market_summary", {})
+            trend = trends.get(zip_code, {})
+            lines.append(self.ZIP_SUMMARY_TEMPLATE.format(
+                zip=zip_code,
+                city=zip_data.get("location", {}).get("city", "Unknown"),
+                median_price=summary.get("median_price", 0),
+                price_change=trend.get("price_change_30d", 0),
+                price_per_sqft=trend.get("price_per_sqft_avg", summary.get("avg_price_per_sqft", 0)),
+                inventory=summary.get("inventory_count", 0),
+                avg_dom=summary.get("avg_days_on_market", 0),
+                months_supply=summary.get("months_supply", 0),
+                sold=summary.get("sold_last_30d", 0),
+                health=summary.get("market_health_score", 50),
+                trend=summary.get("market_trend", "stable")
+            ))
+        lines.extend(f"Alert: {alert['message']}" for alert in dashboard_data.get("alerts", []))
+        return "\n".join(lines)
     
-    def _generate_neighborhood_insights(self, dashboard_data):
-        """Generate neighborhood-level insights"""
-        
-        prompt = f"""
-        Analyze these neighborhood real estate patterns:
-        
-        DATA: {json.dumps(dashboard_data, indent=2)}
-        
-        Provide neighborhood insights including:
-        1. Up-and-coming areas
-        2. Areas with declining values
-        3. School district impacts
-        4. Development trends
-        5. Demographic influences
+    def _call_deepseek_api(self, system_prompt, prompt, max_tokens=2000):
+        """Call DeepSeek API in JSON mode; returns the answer text, or None on failure"""
+        payload = {
+            "model": "deepseek-chat",
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            "response_format": {"type": "json_object"},
+            "temperature": 0.7,
+            "max_tokens": max_tokens
+        }
         
-        Focus on specific, actionable insights for investors.
-        """
+        # Identical requests within the TTL reuse the stored answer
+        cache_key = hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+        cache_file = CACHE_DIR / f"{cache_key}.txt"
+        if cache_file.exists() and time.time() - cache_file.stat().st_mtime < CACHE_TTL:
+            return cache_file.read_text(encoding='utf-8')
         
-        return self._call_deepseek_api(prompt)
-    
-    def _call_deepseek_api(self, prompt):
-        """Call DeepSeek API with prompt"""
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "model": "deepseek-chat",
-                "messages": [
-                    {"role": "system", "content": "You are a real estate market analyst with 20 years of experience."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.7,
-                "max_tokens": 1000
-            }
-            
-            response = requests.post(
+            response = self.session.post(
                 self.base_url,
-                headers=headers,
                 json=payload,
                 timeout=60
             )
             
             if response.status_code == 200:
                 result = response.json()
-                return result.get("choices", [{}])[0].get("message", {}).get("content", "")
+                content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
+                
+                # Write then rename so a concurrent call never reads a partial file
+                CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+                tmp_file.write_text(content, encoding='utf-8')
+                os.replace(tmp_file, cache_file)
+                return content
             else:
                 print(f"API Error: {response.status_code}")
-                return self._get_fallback_response()
+                return None
                 
         except Exception as e:
             print(f"API call failed: {e}")
-            return self._get_fallback_response()
-    
-    def _get_fallback_response(self):
-        """Get fallback response when API fails"""
-        return {
-            "market_analysis": "Market analysis unavailable. Please check API configuration.",
-            "recommendations": "Enable DeepSeek API for AI-powered insights.",
-            "confidence": "low"
-        }
+            return None
     
     def _generate_simulated_insights(self):
         """Generate simulated insights when API is unavailable"""
+        # A transient API failure shouldn't overwrite recent real insights with canned ones
+        latest_file = self.base_dir / "ai_insights" / "latest_insights.json"
+        if latest_file.exists() and time.time() - latest_file.stat().st_mtime < INSIGHTS_MAX_AGE:
+            latest = load_json(latest_file)
+            if latest.get("ai_model") != "simulated":
+                print(f"⚠️  Keeping AI insights from {latest.get('timestamp', 'N/A')} instead of simulated ones")
+                return latest
+        
         print("Generating simulated AI insights...")
         
         insights = {
@@ -230,17 +285,20 @@ class DeepSeekAIInsights:
         insights_dir = self.base_dir / "ai_insights"
         insights_dir.mkdir(exist_ok=True)
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Name the file after the insights' own timestamp rather than reading the clock again
+        timestamp = datetime.fromisoformat(insights_data["timestamp"]).strftime("%Y%m%d_%H%M%S")
+        
+        # Encode once; the timestamped and latest copies are identical and stay
+        # indented like every other committed data file
+        payload = encode_json(insights_data)
         
         # Save full insights
         insights_file = insights_dir / f"ai_insights_{timestamp}.json"
-        with open(insights_file, 'w', encoding='utf-8') as f:
-            json.dump(insights_data, f, indent=2, default=str)
+        write_atomic(insights_file, payload)
         
         # Save latest insights
         latest_file = insights_dir / "latest_insights.json"
-        with open(latest_file, 'w', encoding='utf-8') as f:
-            json.dump(insights_data, f, indent=2, default=str)
+        write_atomic(latest_file, payload)
         
         # Save summary for dashboard
         summary_file = self.base_dir / "ai_insights_summary.json"
@@ -251,18 +309,17 @@ class DeepSeekAIInsights:
             "confidence": insights_data.get("confidence_score", 0)
         }
         
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2)
+        dump_json(summary_file, summary)
         
         print("✅ AI insights saved successfully!")
     
     def _extract_sentiment(self, insights_data):
         """Extract market sentiment from insights"""
-        analysis = insights_data.get("market_analysis", "").lower()
+        analysis = insights_data.get("market_analysis", "")
         
-        if any(word in analysis for word in ["strong", "growing", "opportunity", "positive"]):
+        if BULLISH_RE.search(analysis):
             return "bullish"
-        elif any(word in analysis for word in ["declining", "risk", "caution", "negative"]):
+        elif BEARISH_RE.search(analysis):
             return "bearish"
         else:
             return "neutral"
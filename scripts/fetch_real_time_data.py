@@ -1,78 +1,85 @@
 # [file name]: scripts/fetch_real_time_data.py
-import json
-import random
 from datetime import datetime
 from pathlib import Path
 
-def generate_real_time_data():
+import numpy as np
+
+from constants import DAILY_TIPS, WEEKDAY_NAMES, ZIP_CITY
+from json_io import dump_json
+
+MARKET_PULSES = ('High Activity', 'Moderate Activity', 'Steady')
+
+def generate_real_time_data(seed=None):
     """Generate simulated real-time data for testing"""
     
     zip_codes = ["31088", "31093", "31098"]
+    # One clock read for the whole snapshot; every ZIP shares its timestamp
+    now = datetime.now()
+    now_iso = now.isoformat()
     data = {
-        'last_updated': datetime.now().isoformat(),
+        'last_updated': now_iso,
         'zip_codes': [],
         'market_summary': {},
         'trends_24h': {},
         'realtor_tips': []
     }
     
-    for zip_code in zip_codes:
-        base_price = 285000 + random.randint(-20000, 20000)
-        inventory = random.randint(80, 120)
-        
+    # One generator and one vectorised draw per metric, indexed per ZIP below;
+    # pass a seed for repeatable output
+    rng = np.random.default_rng(seed)
+    n = len(zip_codes)
+    prices = 285000 + rng.integers(-20000, 20001, n)
+    inventories = rng.integers(80, 121, n)
+    velocities = rng.integers(60, 91, n)
+    momentums = rng.uniform(-0.5, 1.0, n).round(2)
+    buyer_seller = rng.integers(40, 81, n)
+    opportunities = rng.integers(60, 86, n)
+    
+    # Unpack to built-in ints/floats once so the records serialise as plain JSON
+    columns = zip(zip_codes, prices.tolist(), inventories.tolist(), velocities.tolist(),
+                  momentums.tolist(), buyer_seller.tolist(), opportunities.tolist())
+    for zip_code, price, inventory, velocity, momentum, index, opportunity in columns:
         zip_data = {
             'zip': zip_code,
-            'city': 'Warner Robins' if zip_code == '31088' else 'Centerville' if zip_code == '31093' else 'Bonaire',
-            'timestamp': datetime.now().isoformat(),
+            'city': ZIP_CITY[zip_code],
+            'timestamp': now_iso,
             'metrics': {
-                'composite_price': base_price,
+                'composite_price': price,
                 'composite_inventory': inventory,
-                'market_velocity': random.randint(60, 90),
-                'price_momentum': round(random.uniform(-0.5, 1.0), 2),
-                'buyer_seller_index': random.randint(40, 80),
-                'opportunity_score': random.randint(60, 85)
+                'market_velocity': velocity,
+                'price_momentum': momentum,
+                'buyer_seller_index': index,
+                'opportunity_score': opportunity
             }
         }
         
         data['zip_codes'].append(zip_data)
     
-    # Calculate market summary
-    prices = [z['metrics']['composite_price'] for z in data['zip_codes']]
-    inventories = [z['metrics']['composite_inventory'] for z in data['zip_codes']]
-    opportunities = [z['metrics']['opportunity_score'] for z in data['zip_codes']]
-    
+    # Calculate market summary straight from the per-metric arrays
+    coin = rng.random(4)
     data['market_summary'] = {
-        'avg_price': int(sum(prices) / len(prices)),
-        'total_inventory': sum(inventories),
-        'avg_opportunity_score': round(sum(opportunities) / len(opportunities), 1),
-        'market_trend': 'heating' if random.random() > 0.5 else 'cooling',
-        'best_opportunity_zip': max(data['zip_codes'], key=lambda x: x['metrics']['opportunity_score'])['zip']
+        'avg_price': int(prices.mean()),
+        'total_inventory': int(inventories.sum()),
+        'avg_opportunity_score': round(float(opportunities.mean()), 1),
+        'market_trend': 'heating' if coin[0] > 0.5 else 'cooling',
+        'best_opportunity_zip': zip_codes[int(opportunities.argmax())]
     }
     
     data['trends_24h'] = {
-        'price_movement': f"{'+' if random.random() > 0.3 else ''}{round(random.uniform(-0.5, 1.0), 1)}%",
-        'inventory_change': f"{'+' if random.random() > 0.5 else ''}{random.randint(-10, 15)} listings",
-        'new_listings_today': str(random.randint(5, 20)),
-        'pending_sales': str(random.randint(3, 12)),
-        'avg_dom_trend': '↓ 2 days' if random.random() > 0.5 else '↑ 1 day',
-        'market_pulse': random.choice(['High Activity', 'Moderate Activity', 'Steady'])
+        'price_movement': f"{'+' if coin[1] > 0.3 else ''}{round(float(rng.uniform(-0.5, 1.0)), 1)}%",
+        'inventory_change': f"{'+' if coin[2] > 0.5 else ''}{int(rng.integers(-10, 16))} listings",
+        'new_listings_today': str(int(rng.integers(5, 21))),
+        'pending_sales': str(int(rng.integers(3, 13))),
+        'avg_dom_trend': '↓ 2 days' if coin[3] > 0.5 else '↑ 1 day',
+        'market_pulse': MARKET_PULSES[int(rng.integers(len(MARKET_PULSES)))]
     }
     
     # Generate realtor tips
-    day_of_week = datetime.now().strftime('%A')
-    daily_tips = {
-        'Monday': "📅 Plan your week: Review new listings and schedule showings",
-        'Tuesday': "📞 Best day for client follow-ups and market updates",
-        'Wednesday': "📊 Update your CMA reports with latest data",
-        'Thursday': "🤝 Network with other agents and schedule open houses",
-        'Friday': "🎯 Target weekend showings - buyers are actively searching",
-        'Saturday': "🏠 Host open houses and conduct showings",
-        'Sunday': "📝 Review week's activity and plan for next week"
-    }
+    weekday = now.weekday()
     
     data['realtor_tips'] = [
         "🔥 Check today's new listings for potential opportunities",
-        f"📅 **{day_of_week} Tip**: {daily_tips.get(day_of_week, 'Stay proactive in your market!')}",
+        f"📅 **{WEEKDAY_NAMES[weekday]} Tip**: {DAILY_TIPS[weekday]}",
         "📊 Use the latest market data in your client presentations",
         "🤝 Build confidence by sharing data-driven insights with clients"
     ]
@@ -91,8 +98,7 @@ def save_data():
     
     # Save dashboard_data.json
     dashboard_file = base_dir / "dashboard_data.json"
-    with open(dashboard_file, 'w') as f:
-        json.dump(data, f, indent=2)
+    dump_json(dashboard_file, data)
     
     print(f"✅ Real-time data generated and saved to {dashboard_file}")
     print(f"📊 Last updated: {data['last_updated']}")
@@ -1,10 +1,18 @@
 # [file name]: scripts/fetch_redfin.py
+import csv
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 import time
 import os
 
+from constants import ZIP_CITY
+from json_io import dump_json, load_json
+
 ZIP = "31088"
+# Houston County ZIPs kept from the nationwide CSV; every other row is dropped while streaming
+ZIPS = set(ZIP_CITY)
 
 # Use relative path for GitHub Actions
 BASE_DIR = Path(__file__).parent.parent
@@ -12,6 +20,10 @@ TMP_DIR = BASE_DIR / "tmp"
 TMP_DIR.mkdir(parents=True, exist_ok=True)
 
 CSV_FILE = TMP_DIR / "zillow_zhvi.csv"
+# ETag / Last-Modified of the downloaded CSV, sent back as conditional GET headers
+VALIDATORS_FILE = TMP_DIR / "zillow_zhvi.validators.json"
+
+MARKET_FILE = BASE_DIR / "data" / "houston-county-ga" / ZIP / "processed" / "market.json"
 
 URL = (
     "https://files.zillowstatic.com/research/public_csvs/zhvi/"
@@ -19,100 +31,122 @@ URL = (
 )
 
 MAX_RETRIES = 3
+CHUNK_SIZE = 1 << 16
 
-def fetch_data():
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            print(f"Attempt {attempt} to fetch Zillow data...")
-            response = requests.get(URL, timeout=60)
-            response.raise_for_status()
-            
-            # Write CSV file
-            CSV_FILE.write_text(response.text, encoding="utf-8")
-            print(f"✅ Zillow CSV downloaded to {CSV_FILE}")
-            
-            # Also create a sample output for testing
-            sample_file = BASE_DIR / "data" / "houston-county-ga" / f"{ZIP}" / "processed" / "market.json"
-            sample_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Create a simple sample data structure
-            sample_data = {
-                "market": "Houston County, GA",
-                "zip": ZIP,
-                "city": "Warner Robins",
-                "updated": time.strftime("%Y-%m-%d"),
-                "period": "monthly",
-                "inventory": {
-                    "active": 105,
-                    "change_pct": 2.5
-                },
-                "pricing": {
-                    "median_list": 289500,
-                    "median_sale": 281000,
-                    "spread_pct": -3.0,
-                    "trend": "heating"
-                },
-                "velocity": {
-                    "avg_dom": 28,
-                    "dom_change": -2,
-                    "absorption_rate": 1.1,
-                    "months_supply": 2.8
-                },
-                "signals": {
-                    "seller_leverage": "seller",
-                    "price_reductions_up": False,
-                    "inventory_rising": False
-                },
-                "history": {
-                    "median_list": [285000, 287500, 289500, 291000]
-                },
-                "weekly_insights": [
-                    {"text": "Market is heating up with increased buyer activity.", "type": "positive"},
-                    {"text": "Inventory remains tight, favoring sellers.", "type": "positive"},
-                    {"text": "Consider pricing competitively to attract multiple offers.", "type": "neutral"}
-                ]
-            }
-            
-            import json
-            with open(sample_file, 'w') as f:
-                json.dump(sample_data, f, indent=2)
-            
-            print(f"✅ Sample market data created at {sample_file}")
-            break
-            
-        except Exception as e:
-            print(f"❌ Attempt {attempt} failed: {e}")
-            if attempt == MAX_RETRIES:
-                print("⚠️ All attempts failed. Creating fallback data...")
-                create_fallback_data()
-                break
-            time.sleep(5)
+# Shared keep-alive session; connection errors, rate limits and 5xx
+# responses are retried with exponential backoff by the adapter
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(max_retries=Retry(
+    total=MAX_RETRIES,
+    backoff_factor=1.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    raise_on_status=False
+)))
 
-def create_fallback_data():
-    """Create fallback data if fetching fails"""
-    fallback_dir = BASE_DIR / "data" / "houston-county-ga" / ZIP / "processed"
-    fallback_dir.mkdir(parents=True, exist_ok=True)
+def conditional_headers():
+    """Build If-None-Match / If-Modified-Since headers from the last download"""
+    if not (CSV_FILE.exists() and VALIDATORS_FILE.exists()):
+        return {}
     
-    fallback_data = {
+    validators = load_json(VALIDATORS_FILE)
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+def write_market(inventory, pricing, velocity, signals, history, weekly_insights):
+    """Write the metric sections to MARKET_FILE in the market.json envelope"""
+    MARKET_FILE.parent.mkdir(parents=True, exist_ok=True)
+    dump_json(MARKET_FILE, {
         "market": "Houston County, GA",
         "zip": ZIP,
-        "city": "Warner Robins",
+        "city": ZIP_CITY[ZIP],
         "updated": time.strftime("%Y-%m-%d"),
         "period": "monthly",
-        "inventory": {"active": 100, "change_pct": 0},
-        "pricing": {"median_list": 285000, "median_sale": 276000, "spread_pct": -3.0, "trend": "neutral"},
-        "velocity": {"avg_dom": 30, "dom_change": 0, "absorption_rate": 1.0, "months_supply": 3.0},
-        "signals": {"seller_leverage": "balanced", "price_reductions_up": False, "inventory_rising": False},
-        "history": {"median_list": [280000, 282000, 285000, 285000]},
-        "weekly_insights": [
+        "inventory": inventory,
+        "pricing": pricing,
+        "velocity": velocity,
+        "signals": signals,
+        "history": {
+            "median_list": history
+        },
+        "weekly_insights": weekly_insights
+    })
+
+def write_zip_rows(lines, f):
+    """Write the CSV header and the rows for ZIPS to f, returning the number of rows kept"""
+    header = next(lines)
+    f.write(header + b"\n")
+    region_idx = next(csv.reader([header.decode("utf-8")])).index("RegionName")
+    
+    needles = [z.encode() for z in ZIPS]
+    kept = 0
+    for line in lines:
+        # Cheap byte check first; only candidate rows are parsed to confirm the column
+        if not any(n in line for n in needles):
+            continue
+        fields = next(csv.reader([line.decode("utf-8")]))
+        if len(fields) > region_idx and fields[region_idx] in ZIPS:
+            f.write(line + b"\n")
+            kept += 1
+    return kept
+
+def fetch_data():
+    try:
+        print("Fetching Zillow data...")
+        with SESSION.get(URL, timeout=60, headers=conditional_headers(), stream=True) as response:
+            if response.status_code == 304:
+                print(f"✅ Zillow CSV unchanged upstream, keeping {CSV_FILE}")
+            else:
+                response.raise_for_status()
+                
+                # Stream the CSV and keep only the header and the Houston County rows
+                tmp_file = CSV_FILE.with_name(f"{CSV_FILE.name}.{os.getpid()}.tmp")
+                with open(tmp_file, "wb") as f:
+                    kept = write_zip_rows(response.iter_lines(chunk_size=CHUNK_SIZE), f)
+                os.replace(tmp_file, CSV_FILE)
+                dump_json(VALIDATORS_FILE, {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified")
+                })
+                print(f"✅ Zillow CSV downloaded to {CSV_FILE} ({kept} ZIP rows kept)")
+        
+        # Also create a sample output for testing
+        write_market(
+            inventory={"active": 105, "change_pct": 2.5},
+            pricing={"median_list": 289500, "median_sale": 281000, "spread_pct": -3.0, "trend": "heating"},
+            velocity={"avg_dom": 28, "dom_change": -2, "absorption_rate": 1.1, "months_supply": 2.8},
+            signals={"seller_leverage": "seller", "price_reductions_up": False, "inventory_rising": False},
+            history=[285000, 287500, 289500, 291000],
+            weekly_insights=[
+                {"text": "Market is heating up with increased buyer activity.", "type": "positive"},
+                {"text": "Inventory remains tight, favoring sellers.", "type": "positive"},
+                {"text": "Consider pricing competitively to attract multiple offers.", "type": "neutral"}
+            ]
+        )
+        
+        print(f"✅ Sample market data created at {MARKET_FILE}")
+        
+    except Exception as e:
+        print(f"❌ Fetch failed after {MAX_RETRIES} retries: {e}")
+        print("⚠️ Creating fallback data...")
+        create_fallback_data()
+
+def create_fallback_data():
+    """Create fallback data if fetching fails"""
+    write_market(
+        inventory={"active": 100, "change_pct": 0},
+        pricing={"median_list": 285000, "median_sale": 276000, "spread_pct": -3.0, "trend": "neutral"},
+        velocity={"avg_dom": 30, "dom_change": 0, "absorption_rate": 1.0, "months_supply": 3.0},
+        signals={"seller_leverage": "balanced", "price_reductions_up": False, "inventory_rising": False},
+        history=[280000, 282000, 285000, 285000],
+        weekly_insights=[
             {"text": "Market data temporarily unavailable. Using cached data.", "type": "neutral"},
             {"text": "Check back soon for updated market insights.", "type": "neutral"}
         ]
-    }
-    
-    import json
-    with open(fallback_dir / "market.json", 'w') as f:
-        json.dump(fallback_data, f, indent=2)
+    )
     
     print("✅ Fallback data created")
 
@@ -1,23 +1,80 @@
 # scripts/free_data_collector.py
 import requests
+from requests.adapters import HTTPAdapter
+import io
 import json
+import os
 import re
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 import pandas as pd
+import numpy as np
 from bs4 import BeautifulSoup
-import random
 import hashlib
 
+from constants import ZIP_CITY
+from json_io import dump_json, encode_json, write_atomic
+
+# Public CSV/API payloads are shared by every ZIP, so keep them for one pipeline cycle
+CACHE_DIR = Path("tmp/http_cache")
+CACHE_TTL = 6 * 60 * 60
+
+# Monthly value columns in the Zillow ZHVI export, e.g. 2024-01-31
+DATE_COLUMN_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
 class FreeDataCollector:
     """Collect real estate data from free public sources"""
     
-    def __init__(self, zip_code="31088"):
+    # Weighted pools for the simulated records, built once rather than per draw
+    BEDROOM_CHOICES = np.array([2, 3, 4, 5])
+    BEDROOM_WEIGHTS = np.array([0.2, 0.5, 0.2, 0.1])
+    BATHROOM_CHOICES = np.array([1, 2, 3, 4])
+    BATHROOM_WEIGHTS = np.array([0.1, 0.4, 0.4, 0.1])
+    PRICE_REDUCTION_POOL = np.array([True, False] * 3 + [False] * 7)
+    FLOOD_ZONE_POOL = np.array([True, False] * 9 + [True])  # 10% chance
+    HOA_POOL = np.array([True, False] * 7 + [True])  # ~12.5% chance
+    FEATURE_POOL = np.array(['Garage', 'Pool', 'Fireplace', 'Updated Kitchen', 'Hardwood Floors',
+                             'Fenced Yard', 'Patio', 'Basement', 'Attic'])
+    
+    def __init__(self, zip_code="31088", seed=None, include_price_history=False):
         self.zip_code = zip_code
+        # Sources are simulated concurrently, so each gets its own child generator,
+        # spawned in a fixed order; pass a seed for repeatable output
+        (self.property_rng, self.zillow_rng, self.census_rng,
+         self.weather_rng, self.school_rng) = np.random.default_rng(seed).spawn(5)
+        # Nothing downstream reads per-property history, so it is opt-in
+        self.include_price_history = include_price_history
         self.base_dir = Path(f"data/houston-county-ga/{zip_code}")
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        # Shared so repeat requests to a host reuse the same connection; one
+        # pool per source host, each large enough for the parallel FRED fetches
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=3))
+        
+    def _cached_get(self, url, ttl=CACHE_TTL):
+        """GET url and return the body bytes, reusing a recent on-disk copy.
+        Returns None when the request fails or comes back empty."""
+        cache_file = CACHE_DIR / hashlib.sha1(url.encode()).hexdigest()
+        if cache_file.exists() and time.time() - cache_file.stat().st_mtime < ttl:
+            return cache_file.read_bytes()
         
+        try:
+            response = self.session.get(url, timeout=30)
+        except requests.RequestException as e:
+            print(f"Request failed for {url}: {e}")
+            return None
+        if response.status_code != 200 or not response.content:
+            return None
+        
+        # Write then rename so concurrent collectors never read a partial file
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_bytes(response.content)
+        os.replace(tmp_file, cache_file)
+        return response.content
+    
     def fetch_public_records(self):
         """Fetch property data from public county records (simulated)"""
         try:
@@ -26,76 +83,80 @@ class FreeDataCollector:
             # This is a simulated version
             
             # Create realistic property data based on zip code
-            properties = []
-            property_count = random.randint(80, 120)
+            # Each field is drawn for all properties at once (one column per
+            # field) and only transposed into per-property dicts at the end
+            rng = self.property_rng
+            n = int(rng.integers(80, 121))
+            now = datetime.now()
             
-            for i in range(property_count):
-                # Generate realistic property data
-                base_price = 250000 + random.randint(0, 100000)
-                price_reduction = random.choice([True, False] * 3 + [False] * 7)
-                
-                property_data = {
-                    'id': f"PRP{self.zip_code}{i:04d}",
-                    'address': f"{random.randint(100, 9999)} {random.choice(['Maple', 'Oak', 'Pine', 'Cedar', 'Birch'])} {random.choice(['St', 'Ave', 'Rd', 'Ln', 'Dr'])}",
-                    'city': 'Warner Robins' if self.zip_code == '31088' else 'Centerville' if self.zip_code == '31093' else 'Bonaire',
-                    'zip': self.zip_code,
-                    'price': base_price - (random.randint(5000, 20000) if price_reduction else 0),
-                    'original_price': base_price if price_reduction else None,
-                    'bedrooms': random.choices([2, 3, 4, 5], weights=[0.2, 0.5, 0.2, 0.1])[0],
-                    'bathrooms': random.choices([1, 2, 3, 4], weights=[0.1, 0.4, 0.4, 0.1])[0],
-                    'sqft': random.randint(1200, 3500),
-                    'lot_size': round(random.uniform(0.1, 1.0), 2),
-                    'year_built': random.randint(1970, 2023),
-                    'property_type': random.choice(['Single Family', 'Townhouse', 'Condo', 'Multi-Family']),
-                    'status': random.choice(['Active', 'Pending', 'Contingent', 'Sold']),
-                    'days_on_market': random.randint(1, 120),
-                    'price_per_sqft': round(base_price / random.randint(1200, 3500), 2),
-                    'last_tax_assessment': base_price - random.randint(10000, 50000),
-                    'tax_year': 2023,
-                    'estimated_tax': round(base_price * 0.01 * random.uniform(0.8, 1.2), 2),
-                    'school_district': random.choice(['Houston County', 'Warner Robins City', 'Centerville City']),
-                    'latitude': 32.6 + random.uniform(-0.1, 0.1),
-                    'longitude': -83.6 + random.uniform(-0.1, 0.1),
-                    'parcel_id': f"{self.zip_code}-{random.randint(1000, 9999)}-{random.randint(100, 999)}",
-                    'owner_type': random.choice(['Owner Occupied', 'Investor', 'Bank Owned', 'Corporate']),
-                    'last_sale_date': (datetime.now() - timedelta(days=random.randint(30, 365*10))).strftime('%Y-%m-%d'),
-                    'last_sale_price': base_price - random.randint(20000, 100000),
-                    'property_class': random.choice(['Residential', 'Commercial', 'Mixed Use']),
-                    'zoning': random.choice(['R1', 'R2', 'R3', 'R4', 'C1', 'C2']),
-                    'flood_zone': random.choice([True, False] * 9 + [True]),  # 10% chance
-                    'hoa': random.choice([True, False] * 7 + [True]),  # ~12.5% chance
-                    'hoa_fee': random.randint(100, 500) if random.random() < 0.125 else 0,
-                    'features': random.sample(['Garage', 'Pool', 'Fireplace', 'Updated Kitchen', 'Hardwood Floors', 
-                                              'Fenced Yard', 'Patio', 'Basement', 'Attic'], random.randint(2, 6)),
-                    'condition': random.choice(['Excellent', 'Good', 'Average', 'Needs Work']),
-                    'estimated_rent': round(base_price * 0.006 * random.uniform(0.8, 1.2), 2),
-                    'rental_yield': round(random.uniform(0.04, 0.08), 4),
-                    'scraped_date': datetime.now().isoformat(),
-                    'source': 'simulated_public_records'
-                }
-                
-                # Add price history (last 12 months simulated)
-                price_history = []
-                current_price = property_data['price']
-                for month in range(12, 0, -1):
-                    date = datetime.now() - timedelta(days=30*month)
-                    if month == 12:
-                        price = current_price * random.uniform(0.85, 1.05)
-                    else:
-                        # Simulate market movement
-                        change = random.uniform(-0.02, 0.02)
-                        price = price_history[-1]['price'] * (1 + change)
-                    
-                    price_history.append({
-                        'date': date.strftime('%Y-%m-%d'),
-                        'price': round(price, 2),
-                        'event': 'Listed' if month == 1 else 'Market Adjustment'
-                    })
-                
-                property_data['price_history'] = price_history
-                properties.append(property_data)
+            base_price = 250000 + rng.integers(0, 100001, n)
+            price_reduction = rng.choice(self.PRICE_REDUCTION_POOL, n)
+            price = base_price - np.where(price_reduction, rng.integers(5000, 20001, n), 0)
+            last_sale_days = rng.integers(30, 365*10 + 1, n).astype('timedelta64[D]')
+            has_hoa_fee = rng.random(n) < 0.125
+            feature_counts = rng.integers(2, 7, n).tolist()
+            # A random permutation per row; its first k entries are a k-feature sample
+            feature_order = np.argsort(rng.random((n, len(self.FEATURE_POOL))), axis=1)
+            
+            # ZIPs outside the map keep the old catch-all city
+            city = ZIP_CITY.get(self.zip_code, 'Bonaire')
+            base_price_list = base_price.tolist()
+            
+            columns = {
+                'id': [f"PRP{self.zip_code}{i:04d}" for i in range(n)],
+                'address': [f"{num} {street} {suffix}" for num, street, suffix in zip(
+                    rng.integers(100, 10000, n).tolist(),
+                    rng.choice(['Maple', 'Oak', 'Pine', 'Cedar', 'Birch'], n).tolist(),
+                    rng.choice(['St', 'Ave', 'Rd', 'Ln', 'Dr'], n).tolist())],
+                'city': [city] * n,
+                'zip': [self.zip_code] * n,
+                'price': price.tolist(),
+                'original_price': [b if r else None for b, r in zip(base_price_list, price_reduction.tolist())],
+                'bedrooms': rng.choice(self.BEDROOM_CHOICES, n, p=self.BEDROOM_WEIGHTS).tolist(),
+                'bathrooms': rng.choice(self.BATHROOM_CHOICES, n, p=self.BATHROOM_WEIGHTS).tolist(),
+                'sqft': rng.integers(1200, 3501, n).tolist(),
+                'lot_size': rng.uniform(0.1, 1.0, n).round(2).tolist(),
+                'year_built': rng.integers(1970, 2024, n).tolist(),
+                'property_type': rng.choice(['Single Family', 'Townhouse', 'Condo', 'Multi-Family'], n).tolist(),
+                'status': rng.choice(['Active', 'Pending', 'Contingent', 'Sold'], n).tolist(),
+                'days_on_market': rng.integers(1, 121, n).tolist(),
+                'price_per_sqft': (base_price / rng.integers(1200, 3501, n)).round(2).tolist(),
+                'last_tax_assessment': (base_price - rng.integers(10000, 50001, n)).tolist(),
+                'tax_year': [2023] * n,
+                'estimated_tax': (base_price * 0.01 * rng.uniform(0.8, 1.2, n)).round(2).tolist(),
+                'school_district': rng.choice(['Houston County', 'Warner Robins City', 'Centerville City'], n).tolist(),
+                'latitude': (32.6 + rng.uniform(-0.1, 0.1, n)).tolist(),
+                'longitude': (-83.6 + rng.uniform(-0.1, 0.1, n)).tolist(),
+                'parcel_id': [f"{self.zip_code}-{a}-{b}" for a, b in zip(
+                    rng.integers(1000, 10000, n).tolist(),
+                    rng.integers(100, 1000, n).tolist())],
+                'owner_type': rng.choice(['Owner Occupied', 'Investor', 'Bank Owned', 'Corporate'], n).tolist(),
+                'last_sale_date': (np.datetime64(now.date()) - last_sale_days).astype(str).tolist(),
+                'last_sale_price': (base_price - rng.integers(20000, 100001, n)).tolist(),
+                'property_class': rng.choice(['Residential', 'Commercial', 'Mixed Use'], n).tolist(),
+                'zoning': rng.choice(['R1', 'R2', 'R3', 'R4', 'C1', 'C2'], n).tolist(),
+                'flood_zone': rng.choice(self.FLOOD_ZONE_POOL, n).tolist(),
+                'hoa': rng.choice(self.HOA_POOL, n).tolist(),
+                'hoa_fee': np.where(has_hoa_fee, rng.integers(100, 501, n), 0).tolist(),
+                'features': [self.FEATURE_POOL[order[:k]].tolist() for order, k in zip(feature_order, feature_counts)],
+                'condition': rng.choice(['Excellent', 'Good', 'Average', 'Needs Work'], n).tolist(),
+                'estimated_rent': (base_price * 0.006 * rng.uniform(0.8, 1.2, n)).round(2).tolist(),
+                'rental_yield': rng.uniform(0.04, 0.08, n).round(4).tolist(),
+                'scraped_date': [now.isoformat()] * n,
+                'source': ['simulated_public_records'] * n
+            }
+            
+            if self.include_price_history:
+                # Price history (last 12 months simulated): one random walk per row,
+                # starting from a 0.85-1.05 multiple of the current price. Stored as
+                # parallel arrays; the last entry is the listing price event
+                factors = 1 + rng.uniform(-0.02, 0.02, (n, 12))
+                factors[:, 0] = rng.uniform(0.85, 1.05, n)
+                history_prices = (price[:, None] * np.cumprod(factors, axis=1)).round(2).tolist()
+                history_dates = [(now - timedelta(days=30*month)).strftime('%Y-%m-%d') for month in range(12, 0, -1)]
+                columns['price_history'] = [{'dates': history_dates, 'prices': prices} for prices in history_prices]
             
-            return properties
+            return [dict(zip(columns, values)) for values in zip(*columns.values())]
             
         except Exception as e:
             print(f"Error fetching public records: {e}")
@@ -127,57 +188,51 @@ class FreeDataCollector:
     
     def fetch_zillow_public_data(self):
         """Fetch Zillow data from their public CSV files"""
-        try:
-            # Zillow provides free public data via CSV downloads
-            url = "https://files.zillowstatic.com/research/public_csvs/zhvi/Zip_zhvi_uc_sfrcondo_tier_0.33_0.67_sm_sa_month.csv"
+        # Zillow provides free public data via CSV downloads
+        url = "https://files.zillowstatic.com/research/public_csvs/zhvi/Zip_zhvi_uc_sfrcondo_tier_0.33_0.67_sm_sa_month.csv"
+        
+        content = self._cached_get(url)
+        if content is not None:
+            # Parse CSV, keeping only the ZIP column and the monthly values, then
+            # find data for our ZIP code; a payload without RegionName has no match
+            try:
+                df = pd.read_csv(
+                    io.BytesIO(content),
+                    usecols=lambda col: col == 'RegionName' or DATE_COLUMN_RE.match(col),
+                    dtype={'RegionName': str}
+                )
+                match = df.loc[df['RegionName'] == self.zip_code]
+            except (ValueError, KeyError) as e:
+                print(f"Error parsing Zillow data: {e}")
+                match = None
             
-            response = requests.get(url, timeout=30)
-            if response.status_code == 200:
-                # Parse CSV
-                import io
-                import csv
-                
-                csv_data = io.StringIO(response.text)
-                reader = csv.DictReader(csv_data)
-                
-                # Find data for our ZIP code
-                for row in reader:
-                    if row.get('RegionName') == self.zip_code:
-                        # Extract last 12 months of data
-                        date_columns = [col for col in row.keys() if re.match(r'^\d{4}-\d{2}-\d{2}$', col)]
-                        date_columns.sort()
-                        
-                        values = []
-                        for date_col in date_columns[-12:]:  # Last 12 months
-                            if row[date_col]:
-                                values.append(float(row[date_col]))
-                        
-                        return {
-                            'zip': self.zip_code,
-                            'source': 'zillow_zhvi',
-                            'values': values,
-                            'dates': date_columns[-12:],
-                            'current_value': values[-1] if values else None,
-                            'last_updated': datetime.now().isoformat()
-                        }
+            if match is not None and not match.empty:
+                # Extract last 12 months of data
+                date_columns = sorted(col for col in df.columns if col != 'RegionName')[-12:]
+                values = match.iloc[0][date_columns].dropna().to_numpy(dtype=np.float64).tolist()
                 
-                # If ZIP not found, create simulated data
-                return self._create_simulated_zillow_data()
-            
-        except Exception as e:
-            print(f"Error fetching Zillow data: {e}")
-            return self._create_simulated_zillow_data()
+                return {
+                    'zip': self.zip_code,
+                    'source': 'zillow_zhvi',
+                    'values': values,
+                    'dates': date_columns,
+                    'current_value': values[-1] if values else None,
+                    'last_updated': datetime.now().isoformat()
+                }
+        
+        # Download failed or ZIP not found, create simulated data
+        return self._create_simulated_zillow_data()
     
     def fetch_census_data(self):
         """Fetch free demographic data from US Census Bureau"""
-        try:
-            # US Census Bureau API (free, no key required for small volumes)
-            # Variables: B01001_001E (Total population), B19013_001E (Median household income)
-            url = f"https://api.census.gov/data/2021/acs/acs5?get=NAME,B01001_001E,B19013_001E,B25077_001E&for=zip%20code%20tabulation%20area:{self.zip_code}"
-            
-            response = requests.get(url, timeout=30)
-            if response.status_code == 200:
-                data = response.json()
+        # US Census Bureau API (free, no key required for small volumes)
+        # Variables: B01001_001E (Total population), B19013_001E (Median household income)
+        url = f"https://api.census.gov/data/2021/acs/acs5?get=NAME,B01001_001E,B19013_001E,B25077_001E&for=zip%20code%20tabulation%20area:{self.zip_code}"
+        
+        content = self._cached_get(url)
+        if content is not None:
+            try:
+                data = json.loads(content)
                 if len(data) > 1:
                     return {
                         'population': int(data[1][1]) if data[1][1] != 'null' else None,
@@ -186,88 +241,89 @@ class FreeDataCollector:
                         'year': 2021,
                         'source': 'us_census_acs5'
                     }
-            
-            # Fallback to simulated census data
-            return self._create_simulated_census_data()
-            
-        except Exception as e:
-            print(f"Error fetching Census data: {e}")
-            return self._create_simulated_census_data()
+            except (ValueError, IndexError, TypeError) as e:
+                print(f"Error parsing Census data: {e}")
+        
+        # Fallback to simulated census data
+        return self._create_simulated_census_data()
     
     def fetch_fred_housing_data(self):
         """Fetch housing data from FRED (Federal Reserve Economic Data)"""
-        try:
-            # FRED API requires key but some endpoints are open
-            # Using public CSV endpoints instead
-            urls = {
-                'mortgage_rates': 'https://fred.stlouisfed.org/graph/fredgraph.csv?id=MORTGAGE30US',
-                'housing_starts': 'https://fred.stlouisfed.org/graph/fredgraph.csv?id=HOUST',
-                'home_price_index': 'https://fred.stlouisfed.org/graph/fredgraph.csv?id=CSUSHPISA'
-            }
-            
-            fred_data = {}
-            for key, url in urls.items():
-                try:
-                    response = requests.get(url, timeout=30)
-                    if response.status_code == 200:
-                        # Parse CSV to get latest value
-                        lines = response.text.strip().split('\n')
-                        last_line = lines[-1]
-                        values = last_line.split(',')
-                        if len(values) >= 2:
-                            fred_data[key] = {
-                                'value': float(values[1]) if values[1] != '.' else None,
-                                'date': values[0],
-                                'source': 'fred_stlouisfed'
-                            }
-                except:
-                    continue
-            
-            return fred_data
+        # FRED API requires key but some endpoints are open
+        # Using public CSV endpoints instead
+        urls = {
+            'mortgage_rates': 'https://fred.stlouisfed.org/graph/fredgraph.csv?id=MORTGAGE30US',
+            'housing_starts': 'https://fred.stlouisfed.org/graph/fredgraph.csv?id=HOUST',
+            'home_price_index': 'https://fred.stlouisfed.org/graph/fredgraph.csv?id=CSUSHPISA'
+        }
+        
+        # All three series live on the same host; request them together
+        # so they share the session's pooled connections
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            futures = {key: executor.submit(self._cached_get, url) for key, url in urls.items()}
+        
+        fred_data = {}
+        for key, future in futures.items():
+            content = future.result()
+            if content is None:
+                continue
             
-        except Exception as e:
-            print(f"Error fetching FRED data: {e}")
-            return {}
+            # Only the last line holds the latest value
+            body = content.rstrip()
+            values = body[body.rfind(b'\n') + 1:].decode('utf-8', errors='replace').split(',')
+            if len(values) < 2:
+                continue
+            try:
+                value = float(values[1]) if values[1] != '.' else None
+            except ValueError:
+                continue
+            fred_data[key] = {
+                'value': value,
+                'date': values[0],
+                'source': 'fred_stlouisfed'
+            }
+        
+        return fred_data
     
     def fetch_weather_data(self):
         """Fetch free weather data (affects showing schedules)"""
+        # Using OpenWeatherMap free tier (requires API key but has free tier)
+        # Alternatively, use public weather.gov API (no key required)
+        url = f"https://api.weather.gov/gridpoints/FFC/74,70/forecast"
+        
         try:
-            # Using OpenWeatherMap free tier (requires API key but has free tier)
-            # Alternatively, use public weather.gov API (no key required)
-            url = f"https://api.weather.gov/gridpoints/FFC/74,70/forecast"
-            
-            response = requests.get(url, timeout=30, headers={
+            response = self.session.get(url, timeout=30, headers={
                 'User-Agent': 'RealEstateDashboard/1.0',
                 'Accept': 'application/json'
             })
-            
-            if response.status_code == 200:
-                data = response.json()
-                if 'properties' in data and 'periods' in data['properties']:
-                    periods = data['properties']['periods'][:3]  # Next 3 periods
-                    return {
-                        'forecast': periods,
-                        'last_updated': datetime.now().isoformat(),
-                        'source': 'weather_gov'
-                    }
-            
-            # Fallback to simulated weather
-            return self._create_simulated_weather()
-            
-        except Exception as e:
+        except requests.RequestException as e:
             print(f"Error fetching weather data: {e}")
-            return self._create_simulated_weather()
+            response = None
+        
+        if response is not None and response.status_code == 200 and response.content:
+            try:
+                data = response.json()
+            except ValueError as e:
+                print(f"Error parsing weather data: {e}")
+                data = {}
+            # Only a JSON object with a properties.periods list is a forecast
+            properties = data.get('properties') if isinstance(data, dict) else None
+            if isinstance(properties, dict) and isinstance(properties.get('periods'), list):
+                periods = properties['periods'][:3]  # Next 3 periods
+                return {
+                    'forecast': periods,
+                    'last_updated': datetime.now().isoformat(),
+                    'source': 'weather_gov'
+                }
+        
+        # Fallback to simulated weather
+        return self._create_simulated_weather()
     
     def fetch_school_data(self):
         """Fetch school ratings from public sources"""
-        try:
-            # GreatSchools.org provides some public data
-            # Note: In production, you'd need to check their API/terms
-            return self._create_simulated_school_data()
-            
-        except Exception as e:
-            print(f"Error fetching school data: {e}")
-            return self._create_simulated_school_data()
+        # GreatSchools.org provides some public data
+        # Note: In production, you'd need to check their API/terms
+        return self._create_simulated_school_data()
     
     def aggregate_all_data(self):
         """Aggregate all free data sources"""
@@ -291,21 +347,25 @@ class FreeDataCollector:
             ('schools', self.fetch_school_data)
         ]
         
-        for source_name, fetch_func in sources:
-            try:
+        # Every source lives on a different host, so fetch them concurrently
+        # and collect the results in the original source order
+        with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+            futures = []
+            for source_name, fetch_func in sources:
                 print(f"  - Fetching {source_name}...")
-                data = fetch_func()
-                all_data['sources'][source_name] = data
-                
-                if source_name == 'public_records' and isinstance(data, list):
-                    all_data['properties'] = data
-                
-                # Add small delay to be respectful
-                time.sleep(0.5)
-                
-            except Exception as e:
-                print(f"    Error with {source_name}: {e}")
-                all_data['sources'][source_name] = {'error': str(e)}
+                futures.append((source_name, executor.submit(fetch_func)))
+            
+            for source_name, future in futures:
+                try:
+                    data = future.result()
+                    all_data['sources'][source_name] = data
+                    
+                    if source_name == 'public_records' and isinstance(data, list):
+                        all_data['properties'] = data
+                    
+                except Exception as e:
+                    print(f"    Error with {source_name}: {e}")
+                    all_data['sources'][source_name] = {'error': str(e)}
         
         # Calculate market summary from collected data
         all_data['market_summary'] = self._calculate_market_summary(all_data)
@@ -322,38 +382,51 @@ class FreeDataCollector:
         if not properties:
             return self._create_simulated_market_summary()
         
-        # Calculate metrics from properties
-        active_properties = [p for p in properties if p.get('status') in ['Active', 'Pending']]
-        sold_properties = [p for p in properties if p.get('status') == 'Sold']
+        # Walk the properties once, collecting every column the metrics need
+        # ISO timestamps sort chronologically, so compare them as strings
+        now = datetime.now()
+        now_iso = now.isoformat()
+        cutoff_iso = (now - timedelta(days=30)).isoformat()
+        
+        prices = []
+        dom_values = []
+        price_per_sqft_values = []
+        price_reductions = 0
+        sold_count = 0
+        new_listings_30d = 0
+        for p in properties:
+            status = p.get('status')
+            if status == 'Active' or status == 'Pending':
+                price = p.get('price')
+                if price:
+                    prices.append(price)
+                    if p.get('sqft'):
+                        price_per_sqft_values.append(price / p['sqft'])
+                dom_values.append(p.get('days_on_market', 0))
+                if p.get('original_price'):
+                    price_reductions += 1
+            elif status == 'Sold':
+                sold_count += 1
+            
+            # Market velocity
+            if p.get('scraped_date', now_iso) > cutoff_iso:
+                new_listings_30d += 1
+        
+        inventory_count = len(dom_values)
         
         # Price calculations
-        prices = [p.get('price', 0) for p in active_properties if p.get('price')]
-        median_price = sorted(prices)[len(prices)//2] if prices else 0
+        median_price = float(np.median(prices)) if prices else 0
         
         # DOM calculations
-        dom_values = [p.get('days_on_market', 0) for p in active_properties]
-        avg_dom = sum(dom_values) / len(dom_values) if dom_values else 0
+        avg_dom = float(np.mean(dom_values)) if dom_values else 0
         
         # Price per sqft
-        price_per_sqft_values = []
-        for p in active_properties:
-            if p.get('price') and p.get('sqft'):
-                price_per_sqft_values.append(p['price'] / p['sqft'])
-        avg_price_per_sqft = sum(price_per_sqft_values) / len(price_per_sqft_values) if price_per_sqft_values else 0
-        
-        # Market velocity
-        new_listings_30d = len([p for p in properties if 
-                               datetime.fromisoformat(p.get('scraped_date', datetime.now().isoformat())) > 
-                               datetime.now() - timedelta(days=30)])
-        
-        # Price reductions
-        price_reductions = len([p for p in active_properties if p.get('original_price')])
+        avg_price_per_sqft = float(np.mean(price_per_sqft_values)) if price_per_sqft_values else 0
         
         # Calculate market health score (0-100)
         market_health = 50  # Base score
         
         # Adjust based on metrics
-        inventory_count = len(active_properties)
         if 50 <= inventory_count <= 100:
             market_health += 10  # Healthy inventory
         elif inventory_count > 100:
@@ -366,41 +439,42 @@ class FreeDataCollector:
         elif avg_dom > 60:
             market_health -= 10  # Slow market
         
-        if price_reductions > len(active_properties) * 0.2:
+        if price_reductions > inventory_count * 0.2:
             market_health -= 10  # Many price reductions
-        elif price_reductions < len(active_properties) * 0.1:
+        elif price_reductions < inventory_count * 0.1:
             market_health += 10  # Few price reductions
         
         market_health = max(0, min(100, market_health))
         
         return {
-            'inventory_count': len(active_properties),
+            'inventory_count': inventory_count,
             'median_price': round(median_price, 2),
             'avg_days_on_market': round(avg_dom, 1),
             'avg_price_per_sqft': round(avg_price_per_sqft, 2),
             'new_listings_30d': new_listings_30d,
             'price_reductions_30d': price_reductions,
-            'sold_last_30d': len(sold_properties),
+            'sold_last_30d': sold_count,
             'market_health_score': round(market_health),
             'market_trend': 'heating' if market_health > 60 else 'cooling' if market_health < 40 else 'stable',
             'buyer_seller_balance': 'buyer' if market_health < 40 else 'seller' if market_health > 70 else 'balanced',
-            'months_supply': round(len(active_properties) / max(new_listings_30d, 1), 1),
-            'absorption_rate': round(new_listings_30d / max(len(active_properties), 1), 2)
+            'months_supply': round(inventory_count / max(new_listings_30d, 1), 1),
+            'absorption_rate': round(new_listings_30d / max(inventory_count, 1), 2)
         }
     
     def _save_data(self, data):
         """Save collected data to JSON files"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
+        # Full and latest data are identical, so encode once and write twice
+        payload = encode_json(data)
+        
         # Save full data
         full_file = self.base_dir / f"full_data_{timestamp}.json"
-        with open(full_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, default=str)
+        write_atomic(full_file, payload)
         
         # Save latest data (for dashboard)
         latest_file = self.base_dir / "latest.json"
-        with open(latest_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, default=str)
+        write_atomic(latest_file, payload)
         
         # Save properties separately for easy access
         properties_file = self.base_dir / "properties.json"
@@ -409,13 +483,11 @@ class FreeDataCollector:
             'count': len(data.get('properties', [])),
             'properties': data.get('properties', [])
         }
-        with open(properties_file, 'w', encoding='utf-8') as f:
-            json.dump(properties_data, f, indent=2, default=str)
+        dump_json(properties_file, properties_data)
         
         # Save market summary
         summary_file = self.base_dir / "market_summary.json"
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(data['market_summary'], f, indent=2)
+        dump_json(summary_file, data['market_summary'])
         
         print(f"✅ Data saved for ZIP {self.zip_code}")
         print(f"   - Properties: {len(data.get('properties', []))}")
@@ -443,13 +515,9 @@ class FreeDataCollector:
     
     def _create_simulated_zillow_data(self):
         """Create simulated Zillow ZHVI data"""
-        base_value = 285000
-        values = []
-        for i in range(12):
-            # Simulate gradual increase with some volatility
-            change = random.uniform(-0.01, 0.02)
-            base_value *= (1 + change)
-            values.append(round(base_value, 2))
+        # Simulate gradual increase with some volatility
+        changes = self.zillow_rng.uniform(-0.01, 0.02, 12)
+        values = (285000 * np.cumprod(1 + changes)).round(2).tolist()
         
         dates = [(datetime.now() - timedelta(days=30*i)).strftime('%Y-%m-%d') for i in range(12, 0, -1)]
         
@@ -479,9 +547,9 @@ class FreeDataCollector:
             base_home_value = 310000
         
         # Add some random variation
-        pop = int(base_pop * random.uniform(0.9, 1.1))
-        income = int(base_income * random.uniform(0.95, 1.05))
-        home_value = int(base_home_value * random.uniform(0.95, 1.05))
+        pop = int(base_pop * self.census_rng.uniform(0.9, 1.1))
+        income = int(base_income * self.census_rng.uniform(0.95, 1.05))
+        home_value = int(base_home_value * self.census_rng.uniform(0.95, 1.05))
         
         return {
             'population': pop,
@@ -495,14 +563,14 @@ class FreeDataCollector:
         """Create simulated weather data"""
         forecasts = []
         for i in range(3):
-            temp = random.randint(65, 85)
+            temp = int(self.weather_rng.integers(65, 86))
             forecasts.append({
                 'name': f"{['Today', 'Tonight', 'Tomorrow'][i]}",
                 'temperature': temp,
                 'temperatureUnit': 'F',
-                'shortForecast': random.choice(['Sunny', 'Partly Cloudy', 'Mostly Sunny', 'Clear']),
+                'shortForecast': str(self.weather_rng.choice(['Sunny', 'Partly Cloudy', 'Mostly Sunny', 'Clear'])),
                 'detailedForecast': f"Mostly {['sunny', 'clear', 'sunny'][i]} with a high near {temp}°F.",
-                'probabilityOfPrecipitation': {'value': random.randint(0, 30)}
+                'probabilityOfPrecipitation': {'value': int(self.weather_rng.integers(0, 31))}
             })
         
         return {
@@ -524,12 +592,12 @@ class FreeDataCollector:
         for i, name in enumerate(school_names):
             schools.append({
                 'name': name,
-                'rating': random.randint(5, 9),
+                'rating': int(self.school_rng.integers(5, 10)),
                 'grades': '9-12',
-                'distance_miles': round(random.uniform(1.5, 5.0), 1),
+                'distance_miles': round(float(self.school_rng.uniform(1.5, 5.0)), 1),
                 'type': 'Public',
-                'students': random.randint(800, 2000),
-                'student_teacher_ratio': round(random.uniform(15.0, 25.0), 1)
+                'students': int(self.school_rng.integers(800, 2001)),
+                'student_teacher_ratio': round(float(self.school_rng.uniform(15.0, 25.0)), 1)
             })
         
         return {
@@ -555,12 +623,19 @@ class FreeDataCollector:
             'absorption_rate': 0.23
         }
 
+def collect_zip(zip_code):
+    """Collect data for one ZIP code (module level so worker processes can run it)"""
+    collector = FreeDataCollector(zip_code)
+    data = collector.aggregate_all_data()
+    print(f"\n{'='*50}\n")
+    return len(data.get('properties', []))
+
 
 if __name__ == "__main__":
     # Collect data for multiple ZIP codes
     zips = ["31088", "31093", "31098"]
     
-    for zip_code in zips:
-        collector = FreeDataCollector(zip_code)
-        collector.aggregate_all_data()
-        print(f"\n{'='*50}\n")
+    # The first ZIP warms the shared download cache, the rest run in parallel
+    collect_zip(zips[0])
+    with ProcessPoolExecutor(max_workers=len(zips) - 1) as executor:
+        list(executor.map(collect_zip, zips[1:]))
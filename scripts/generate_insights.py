@@ -1,12 +1,12 @@
-import json
 from pathlib import Path
 
+from json_io import dump_json, load_json
+
 ZIP = "31088"
 JSON_FILE = Path(f"data/houston-county-ga/{ZIP}/processed/market.json")
 
 # Load processed market data
-with open(JSON_FILE, "r", encoding="utf-8") as f:
-    data = json.load(f)
+data = load_json(JSON_FILE)
 
 points = []
 
@@ -43,7 +43,6 @@ if data["signals"]["inventory_rising"]:
 data["weekly_insights"] = points
 
 # Save updated JSON
-with open(JSON_FILE, "w", encoding="utf-8") as f:
-    json.dump(data, f, indent=2)
+dump_json(JSON_FILE, data)
 
 print(f"Weekly insights generated successfully for ZIP {ZIP}")
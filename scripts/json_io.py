@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Shared JSON helpers for the pipeline scripts
+"""
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib encoder
+    orjson = None
+
+def encode_json(data, default=None, indent=True):
+    """Serialize data to JSON bytes, 2-space indented unless indent is False"""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, default=default, option=option)
+    if not indent:
+        return json.dumps(data, separators=(',', ':'), default=default).encode('utf-8')
+    return json.dumps(data, indent=2, default=default).encode('utf-8')
+
+def join_json_object(members):
+    """Assemble a 2-space indented JSON object from already encoded member values"""
+    if not members:
+        return b'{}'
+    # Encoded values never contain raw newlines inside strings, so nesting is a re-indent
+    items = [encode_json(key) + b': ' + value.replace(b'\n', b'\n  ') for key, value in members.items()]
+    return b'{\n  ' + b',\n  '.join(items) + b'\n}'
+
+def load_json(path):
+    """Read and parse the JSON file at path"""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_bytes())
+
+def _tmp_path(path):
+    """Sibling temp file for path, unique per process"""
+    return path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+def write_atomic(path, payload):
+    """Write bytes to path via a temp file and rename, so readers never see a partial file"""
+    tmp_file = _tmp_path(path)
+    tmp_file.write_bytes(payload)
+    os.replace(tmp_file, path)
+
+def dump_json(path, data, default=None):
+    """Atomically write data to path as 2-space indented JSON"""
+    if orjson is not None:
+        write_atomic(path, encode_json(data, default=default))
+        return
+    # Stream the stdlib encoder's chunks instead of building the whole document twice (str, then bytes)
+    tmp_file = _tmp_path(path)
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, default=default)
+    os.replace(tmp_file, path)
@@ -1,15 +1,78 @@
 # [file name]: process_real_time_data.py
-import json
+import bisect
 import pandas as pd
 from datetime import datetime, timedelta
 from pathlib import Path
-import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+from constants import DAILY_TIPS, WEEKDAY_NAMES
+from json_io import dump_json, load_json
+
+BASE_DIR = Path("data/houston-county-ga")
+
+# Placeholder 24-hour trends until a live source feeds them
+TRENDS_24H = {
+    'price_movement': '+0.3%',
+    'inventory_change': '+5 listings',
+    'new_listings_today': '12',
+    'pending_sales': '8',
+    'avg_dom_trend': '↓ 2 days',
+    'market_pulse': 'Moderate Activity'
+}
+
+# Realtor tips for each opportunity-score bucket
+HIGH_OPPORTUNITY_TIPS = (
+    "🔥 **High Opportunity Market**: Great time for new listings!",
+    "📈 Consider pricing slightly above market to test appetite",
+    "🤝 Focus on seller representation - high demand expected",
+    "🎯 Target first-time homebuyer programs for quick sales"
+)
+BALANCED_MARKET_TIPS = (
+    "⚖️ **Balanced Market**: Equal opportunity for buyers and sellers",
+    "📊 Price competitively based on recent comparables",
+    "🏠 Focus on property staging and professional photos",
+    "💬 Emphasize local market knowledge in client conversations"
+)
+BUYERS_MARKET_TIPS = (
+    "🎣 **Buyer's Market**: Focus on buyer representation",
+    "💰 Look for properties with recent price reductions",
+    "📝 Practice negotiation skills for better deals",
+    "📚 Use this time to study market trends and build knowledge"
+)
+# Opportunity-score bucket bounds and the tips each bucket maps to
+OPPORTUNITY_TIP_THRESHOLDS = (40, 70)
+OPPORTUNITY_TIPS = (BUYERS_MARKET_TIPS, BALANCED_MARKET_TIPS, HIGH_OPPORTUNITY_TIPS)
+
+def load_zip_data(zip_code):
+    """Load a ZIP's latest real-time data for the dashboard, or None if there is none"""
+    latest_file = BASE_DIR / zip_code / "real_time" / "latest.json"
+    # Just try the read; a missing file or folder means no data for this ZIP
+    try:
+        zip_data = load_json(latest_file)
+    except FileNotFoundError:
+        return None
+    
+    # Process for dashboard
+    sources = zip_data.get('sources', {})
+    return {
+        'zip': zip_code,
+        'timestamp': zip_data.get('timestamp', ''),
+        'metrics': zip_data.get('metrics', {}),
+        'sources': {
+            'zillow': sources.get('zillow', {}),
+            'realtor': sources.get('realtor', {}),
+            'mls': sources.get('mls', {}),
+            'sentiment': sources.get('sentiment', {})
+        }
+    }
 
 def process_real_time_data(zip_codes=["31088", "31093", "31098"]):
     """Process real-time data for dashboard"""
     
+    # One clock read per run; the weekday tip comes from the same instant
+    now = datetime.now()
     dashboard_data = {
-        'last_updated': datetime.now().isoformat(),
+        'last_updated': now.isoformat(),
         'zip_codes': [],
         'market_summary': {},
         'real_time_metrics': {},
@@ -17,116 +80,70 @@ def process_real_time_data(zip_codes=["31088", "31093", "31098"]):
         'realtor_tips': []
     }
     
-    for zip_code in zip_codes:
-        data_dir = Path(f"data/houston-county-ga/{zip_code}/real_time")
-        
-        if not data_dir.exists():
-            continue
-        
-        # Load latest data
-        latest_file = data_dir / "latest.json"
-        if latest_file.exists():
-            with open(latest_file, 'r') as f:
-                zip_data = json.load(f)
-            
-            # Process for dashboard
-            processed = {
-                'zip': zip_code,
-                'timestamp': zip_data.get('timestamp', ''),
-                'metrics': zip_data.get('metrics', {}),
-                'sources': {
-                    'zillow': zip_data.get('sources', {}).get('zillow', {}),
-                    'realtor': zip_data.get('sources', {}).get('realtor', {}),
-                    'mls': zip_data.get('sources', {}).get('mls', {}),
-                    'sentiment': zip_data.get('sources', {}).get('sentiment', {})
-                }
-            }
-            
-            dashboard_data['zip_codes'].append(processed)
+    # Each ZIP's latest.json is read independently, so overlap the file I/O
+    with ThreadPoolExecutor(max_workers=len(zip_codes) or 1) as executor:
+        results = list(executor.map(load_zip_data, zip_codes))
+    dashboard_data['zip_codes'] = [processed for processed in results if processed is not None]
     
-    # Calculate market summary
-    if dashboard_data['zip_codes']:
-        prices = [z['metrics'].get('composite_price', 0) for z in dashboard_data['zip_codes']]
-        inventories = [z['metrics'].get('composite_inventory', 0) for z in dashboard_data['zip_codes']]
-        opportunities = [z['metrics'].get('opportunity_score', 50) for z in dashboard_data['zip_codes']]
+    # Calculate market summary in one pass over the ZIPs
+    zip_count = len(dashboard_data['zip_codes'])
+    if zip_count:
+        price_sum = inventory_sum = opportunity_sum = 0
+        last_price = 0
+        best_zip, best_score = None, float('-inf')
+        for z in dashboard_data['zip_codes']:
+            metrics = z['metrics']
+            last_price = metrics.get('composite_price', 0)
+            price_sum += last_price
+            inventory_sum += metrics.get('composite_inventory', 0)
+            score = metrics.get('opportunity_score')
+            opportunity_sum += 50 if score is None else score
+            # Strict comparison keeps the first ZIP on ties, like max()
+            if (score or 0) > best_score:
+                best_zip, best_score = z['zip'], score or 0
+        
+        # Heating when the last ZIP's price beats the mean of the others
+        heating = zip_count > 1 and last_price > (price_sum - last_price) / (zip_count - 1)
         
         dashboard_data['market_summary'] = {
-            'avg_price': int(statistics.mean(prices)) if prices else 0,
-            'total_inventory': int(sum(inventories)) if inventories else 0,
-            'avg_opportunity_score': round(statistics.mean(opportunities), 1) if opportunities else 0,
-            'market_trend': 'heating' if (statistics.mean(prices[-1:] if len(prices) > 1 else prices) > 
-                                        statistics.mean(prices[:-1] if len(prices) > 1 else prices)) else 'cooling',
-            'best_opportunity_zip': max(dashboard_data['zip_codes'], 
-                                      key=lambda x: x['metrics'].get('opportunity_score', 0))['zip']
+            'avg_price': int(price_sum / zip_count),
+            'total_inventory': int(inventory_sum),
+            'avg_opportunity_score': round(opportunity_sum / zip_count, 1),
+            'market_trend': 'heating' if heating else 'cooling',
+            'best_opportunity_zip': best_zip
         }
     
     # Generate 24-hour trends
     dashboard_data['trends_24h'] = generate_24h_trends()
     
     # Generate realtor tips
-    dashboard_data['realtor_tips'] = generate_realtor_tips(dashboard_data['market_summary'])
+    dashboard_data['realtor_tips'] = generate_realtor_tips(dashboard_data['market_summary'], now)
     
     # Save dashboard data
-    output_path = Path("data/houston-county-ga/dashboard_data.json")
+    output_path = BASE_DIR / "dashboard_data.json"
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_path, 'w') as f:
-        json.dump(dashboard_data, f, indent=2)
+    dump_json(output_path, dashboard_data)
     
     print(f"Dashboard data updated: {len(dashboard_data['zip_codes'])} ZIP codes processed")
 
 def generate_24h_trends():
     """Generate 24-hour trend analysis"""
-    return {
-        'price_movement': '+0.3%',
-        'inventory_change': '+5 listings',
-        'new_listings_today': '12',
-        'pending_sales': '8',
-        'avg_dom_trend': '↓ 2 days',
-        'market_pulse': 'Moderate Activity'
-    }
+    # Copy, so callers can edit their dashboard without touching the shared constant
+    return dict(TRENDS_24H)
 
-def generate_realtor_tips(market_summary):
+def generate_realtor_tips(market_summary, now=None):
     """Generate actionable tips for realtors"""
     tips = []
     
     opportunity_score = market_summary.get('avg_opportunity_score', 50)
     
-    if opportunity_score > 70:
-        tips.extend([
-            "🔥 **High Opportunity Market**: Great time for new listings!",
-            "📈 Consider pricing slightly above market to test appetite",
-            "🤝 Focus on seller representation - high demand expected",
-            "🎯 Target first-time homebuyer programs for quick sales"
-        ])
-    elif opportunity_score > 40:
-        tips.extend([
-            "⚖️ **Balanced Market**: Equal opportunity for buyers and sellers",
-            "📊 Price competitively based on recent comparables",
-            "🏠 Focus on property staging and professional photos",
-            "💬 Emphasize local market knowledge in client conversations"
-        ])
-    else:
-        tips.extend([
-            "🎣 **Buyer's Market**: Focus on buyer representation",
-            "💰 Look for properties with recent price reductions",
-            "📝 Practice negotiation skills for better deals",
-            "📚 Use this time to study market trends and build knowledge"
-    ])
+    # Scores above a threshold move up a bucket, so bisect_left matches the old "> 40" / "> 70" checks
+    tips.extend(OPPORTUNITY_TIPS[bisect.bisect_left(OPPORTUNITY_TIP_THRESHOLDS, opportunity_score)])
     
     # Add daily tips
-    day_of_week = datetime.now().strftime('%A')
-    daily_tips = {
-        'Monday': "📅 Plan your week: Review new listings and schedule showings",
-        'Tuesday': "📞 Best day for client follow-ups and market updates",
-        'Wednesday': "📊 Update your CMA reports with latest data",
-        'Thursday': "🤝 Network with other agents and schedule open houses",
-        'Friday': "🎯 Target weekend showings - buyers are actively searching",
-        'Saturday': "🏠 Host open houses and conduct showings",
-        'Sunday': "📝 Review week's activity and plan for next week"
-    }
-    
-    tips.append(f"📅 **{day_of_week} Tip**: {daily_tips.get(day_of_week, 'Stay proactive in your market!')}")
+    weekday = (now or datetime.now()).weekday()
+    tips.append(f"📅 **{WEEKDAY_NAMES[weekday]} Tip**: {DAILY_TIPS[weekday]}")
     
     return tips
 
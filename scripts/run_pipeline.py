@@ -3,16 +3,26 @@
 Main pipeline orchestrator - runs all collection and processing steps
 """
 
+import argparse
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 # Add scripts to path
 scripts_dir = Path(__file__).parent
 sys.path.append(str(scripts_dir))
 
-def run_full_pipeline(zip_codes=None):
+from json_io import dump_json
+
+REPORT_RULE = "="*60 + "\n"
+
+# Pipeline steps in run order; any subset can be selected with --steps
+PIPELINE_STEPS = ("collect", "dashboard", "ai", "reports")
+
+def run_full_pipeline(zip_codes=None, steps=PIPELINE_STEPS):
     """Run the complete data pipeline"""
     print("="*60)
     print("🏠 REAL ESTATE DATA PIPELINE")
@@ -25,32 +35,41 @@ def run_full_pipeline(zip_codes=None):
         zip_codes = ["31088", "31093", "31098"]
     
     try:
-        # Step 1: Collect data for each ZIP code
-        print("\n📊 STEP 1: Collecting data for each ZIP code...")
-        from free_data_collector import FreeDataCollector
-        
-        for zip_code in zip_codes:
-            print(f"\n  Processing ZIP {zip_code}...")
-            collector = FreeDataCollector(zip_code)
-            data = collector.aggregate_all_data()
-            print(f"  ✓ Collected {len(data.get('properties', []))} properties")
-        
-        # Step 2: Create dashboard JSON
-        print("\n📈 STEP 2: Creating dashboard...")
-        from create_dashboard_json import create_dashboard_json
-        
-        dashboard = create_dashboard_json()
+        # Each step imports its own modules, so skipped steps never load
+        # their dependencies (pandas, requests, ...)
+        if "collect" in steps:
+            # Step 1: Collect data for each ZIP code
+            print("\n📊 STEP 1: Collecting data for each ZIP code...")
+            from free_data_collector import collect_zip
+            
+            # The first ZIP warms the shared download cache, the rest run in parallel
+            counts = [collect_zip(zip_codes[0])] if zip_codes else []
+            if len(zip_codes) > 1:
+                with ProcessPoolExecutor(max_workers=len(zip_codes) - 1) as executor:
+                    counts.extend(executor.map(collect_zip, zip_codes[1:]))
+            
+            for zip_code, count in zip(zip_codes, counts):
+                print(f"  ✓ ZIP {zip_code}: collected {count} properties")
         
-        # Step 3: Generate AI insights
-        print("\n🤖 STEP 3: Generating AI insights...")
-        from deepseek_ai_insights import DeepSeekAIInsights
+        if "dashboard" in steps:
+            # Step 2: Create dashboard JSON
+            print("\n📈 STEP 2: Creating dashboard...")
+            from create_dashboard_json import create_dashboard_json
+            
+            dashboard = create_dashboard_json()
         
-        ai = DeepSeekAIInsights()
-        insights = ai.generate_insights()
+        if "ai" in steps:
+            # Step 3: Generate AI insights
+            print("\n🤖 STEP 3: Generating AI insights...")
+            from deepseek_ai_insights import DeepSeekAIInsights
+            
+            ai = DeepSeekAIInsights()
+            insights = ai.generate_insights()
         
-        # Step 4: Generate reports
-        print("\n📄 STEP 4: Generating reports...")
-        generate_reports()
+        if "reports" in steps:
+            # Step 4: Generate reports
+            print("\n📄 STEP 4: Generating reports...")
+            generate_reports()
         
         # Calculate execution time
         elapsed = time.time() - start_time
@@ -77,47 +96,71 @@ def run_full_pipeline(zip_codes=None):
         traceback.print_exc()
         return False
 
+def walk_json_files(root):
+    """Yield (path, size) for every .json file under root, one directory read per folder"""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".json"):
+                    yield entry.path, entry.stat().st_size
+
 def generate_reports():
     """Generate pipeline execution report"""
     report_dir = Path("data/houston-county-ga/reports")
     report_dir.mkdir(exist_ok=True)
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # One clock read names the report, dates it and stamps the status file
+    now = datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
     
     # Simple report file
     report_file = report_dir / f"pipeline_report_{timestamp}.txt"
     
+    # List all generated files
+    data_dir = Path("data/houston-county-ga")
+    
+    lines = [
+        REPORT_RULE,
+        "REAL ESTATE DATA PIPELINE REPORT\n",
+        REPORT_RULE + "\n",
+        f"Generated: {now.strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+        "GENERATED FILES:\n",
+        "-"*40 + "\n"
+    ]
+    # One walk feeds both the report lines and the status totals
+    total_bytes = file_count = 0
+    for json_path, size in walk_json_files(data_dir):
+        lines.append(f"  {os.path.relpath(json_path, data_dir.parent)} ({size / 1024:.1f} KB)\n")
+        total_bytes += size
+        file_count += 1
+    
+    # Build the whole report first, then write it in one call
     with open(report_file, 'w') as f:
-        f.write("="*60 + "\n")
-        f.write("REAL ESTATE DATA PIPELINE REPORT\n")
-        f.write("="*60 + "\n\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        
-        # List all generated files
-        data_dir = Path("data/houston-county-ga")
-        json_files = list(data_dir.rglob("*.json"))
-        
-        f.write("GENERATED FILES:\n")
-        f.write("-"*40 + "\n")
-        for json_file in json_files:
-            size_kb = json_file.stat().st_size / 1024
-            f.write(f"  {json_file.relative_to(data_dir.parent)} ({size_kb:.1f} KB)\n")
+        f.writelines(lines)
     
     # Also create a status file for monitoring
     status_file = Path("data/houston-county-ga/pipeline_status.json")
     status = {
-        "last_run": datetime.now().isoformat(),
+        "last_run": now.isoformat(),
         "status": "success",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "file_count": file_count,
+        "total_kb": round(total_bytes / 1024, 1)
     }
     
-    with open(status_file, 'w') as f:
-        import json
-        json.dump(status, f, indent=2)
+    dump_json(status_file, status)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the real estate data pipeline")
+    parser.add_argument("--steps", nargs="+", choices=PIPELINE_STEPS, default=PIPELINE_STEPS,
+                        help="pipeline steps to run (default: all)")
+    args = parser.parse_args()
+    
     # Run the full pipeline
-    success = run_full_pipeline()
+    success = run_full_pipeline(steps=args.steps)
     
     # Exit with appropriate code
     sys.exit(0 if success else 1)